@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Bank, Transaction
+from .models import Bank, Category, ImportJob, Transaction
 
 # Register your models here.
 class BankAdmin(admin.ModelAdmin):
@@ -10,5 +10,14 @@ class TransactionAdmin(admin.ModelAdmin):
     search_fields = ['account', 'description']
     raw_id_fields = ['account']
 
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'position']
+
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'phase', 'incremental', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['status']
+
 admin.site.register(Bank, BankAdmin)
-admin.site.register(Transaction, TransactionAdmin)
\ No newline at end of file
+admin.site.register(Transaction, TransactionAdmin)
+admin.site.register(Category, CategoryAdmin)
+admin.site.register(ImportJob, ImportJobAdmin)
\ No newline at end of file
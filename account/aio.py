@@ -0,0 +1,45 @@
+# account/aio.py
+"""Helpers for the async report views.
+
+Pandas and other CPU-bound steps run on a small shared thread pool
+(``REPORT_EXECUTOR_WORKERS`` threads) instead of the event loop, so one
+heavy report can't stall every other request, and a burst of them queues
+instead of starting a thread each.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.shortcuts import render
+from trackalytics.timing import propagate
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def report_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REPORT_EXECUTOR_WORKERS, thread_name_prefix="report",
+            )
+        return _executor
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """Await ``func(*args, **kwargs)`` run on the report executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(report_executor(), propagate(partial(func, *args, **kwargs)))
+
+
+async def arender(request, template_name, context):
+    """``render`` for async views.
+
+    The user (and with it the session) is loaded through the async ORM
+    first, so templates reading ``request.user`` don't query the database
+    from the event loop.
+    """
+    request.user = await request.auser()
+    return render(request, template_name, context)
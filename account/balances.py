@@ -0,0 +1,130 @@
+# account/balances.py
+"""Running account balances, computed on import and served from ``DailyBalance``.
+
+Each account's opening balance is worked back from the first balance the
+sheet gives for it; from there the balance is a cumulative sum of money in
+minus money out, in integer paise. Rows whose sheet balance differs from
+it are flagged ``balance_mismatch``.
+"""
+import math
+import numpy as np
+import pandas as pd
+from .models import DailyBalance, Transaction
+from .queries import top_n_per_group
+from .reports import paise_to_rupees
+from trackalytics.timing import timed
+
+
+def _paise(series):
+    return np.rint(series.fillna(0.0).to_numpy(dtype=float) * 100).astype(np.int64)
+
+
+def running_balances(rows):
+    """Compute balances for normalized import rows.
+
+    Returns ``(daily, mismatched)``: a frame of ``account``, ``date`` and the
+    closing ``balance`` in paise for every account-day, and the sync keys of
+    rows whose sheet balance disagrees with the computed one. Rows with a
+    blank sheet balance (NaN from ``preprocess_transaction_data``) are never
+    flagged, and the opening balance comes from the first non-blank one.
+    """
+    frame = pd.DataFrame({
+        'account': rows['account'].to_numpy(),
+        'date': rows['date'].to_numpy(),
+        'sync_key': rows['sync_key'].to_numpy(),
+        'movement': _paise(rows['money_in']) - _paise(rows['money_out']),
+        'sheet_balance': np.rint(rows['account_balance'].to_numpy(dtype=float) * 100),
+    }).dropna(subset=['account', 'date'])
+    # Sheet order is kept for rows on the same day.
+    frame = frame.sort_values(['account', 'date'], kind='stable')
+
+    moved = frame.groupby('account', sort=False)['movement'].cumsum()
+    # Opening balance: the first sheet balance in the account, less everything moved up to it.
+    opening = (frame['sheet_balance'] - moved).groupby(frame['account'], sort=False).transform('first')
+    frame['balance'] = moved + opening.fillna(0).astype(np.int64)
+
+    known = frame['sheet_balance'].notna()
+    mismatched = frame.loc[known & (frame['balance'] != frame['sheet_balance']), 'sync_key'].tolist()
+    daily = frame.drop_duplicates(['account', 'date'], keep='last')[['account', 'date', 'balance']]
+    return daily, mismatched
+
+
+def refresh_balances(rows, bank_ids, batch_size=2000, key_field='sync_key'):
+    """Rebuild ``DailyBalance`` and the mismatch flags from the full set of import rows.
+
+    ``key_field`` is the ``Transaction`` field held in the rows' ``sync_key`` column.
+    """
+    daily, mismatched = running_balances(rows)
+
+    DailyBalance.objects.all().delete()
+    DailyBalance.objects.bulk_create([
+        DailyBalance(account_id=bank_ids[account], date=day, balance=paise_to_rupees(balance))
+        for account, day, balance in zip(
+            daily['account'].tolist(), daily['date'].dt.date.tolist(), daily['balance'].tolist()
+        )
+    ], batch_size=batch_size)
+
+    Transaction.objects.filter(balance_mismatch=True).update(balance_mismatch=False)
+    for start in range(0, len(mismatched), batch_size):
+        Transaction.objects.filter(
+            **{f'{key_field}__in': mismatched[start:start + batch_size]}
+        ).update(balance_mismatch=True)
+    return len(daily), len(mismatched)
+
+
+def rebuild_balances(batch_size=2000):
+    """``refresh_balances`` from the stored transactions, for changes made outside an import.
+
+    Rows on the same day are taken in id order, which is sheet order for
+    rows written by a full import.
+    """
+    rows = pd.DataFrame.from_records(
+        Transaction.objects.order_by('id')
+        .values_list('account', 'date', 'id', 'money_in', 'money_out', 'account_balance'),
+        columns=['account', 'date', 'sync_key', 'money_in', 'money_out', 'account_balance'],
+    ).astype({'money_in': float, 'money_out': float, 'account_balance': float})
+    rows['date'] = pd.to_datetime(rows['date'])
+    accounts = rows['account'].dropna().unique().tolist()
+    return refresh_balances(rows, dict(zip(accounts, accounts)), batch_size, key_field='id')
+
+
+@timed("compute")
+def balance_series(start_date, end_date, points=120, **filters):
+    """Daily balances per account over ``[start_date, end_date]``, downsampled to at most ``points`` days.
+
+    Days without transactions carry the previous balance forward, starting
+    from the last one before ``start_date``. Returns ``(days, balances)``
+    where ``balances`` maps account name to a list of rupee floats (None
+    before the account's first known balance).
+    """
+    balances = DailyBalance.objects.filter(**filters)
+    opening = top_n_per_group(
+        balances.filter(date__lt=start_date).values('account__name', 'date', 'balance'),
+        ['account'], ['-date'], 1,
+    )
+    in_range = balances.filter(date__range=[start_date, end_date]).values('account__name', 'date', 'balance')
+
+    frame = pd.DataFrame.from_records(
+        [{**row, 'date': max(row['date'], start_date)} for row in opening] + list(in_range),
+        columns=['account__name', 'date', 'balance'],
+    )
+    days = pd.date_range(start_date, end_date, freq='D').date
+    if frame.empty:
+        return [], {}
+
+    step = max(1, math.ceil(len(days) / points))
+    sampled = list(range(0, len(days), step))
+    if sampled[-1] != len(days) - 1:
+        sampled[-1] = len(days) - 1  # always end on end_date
+
+    grid = (
+        frame.astype({'balance': float})
+        .drop_duplicates(['account__name', 'date'], keep='last')
+        .pivot(index='date', columns='account__name', values='balance')
+        .reindex(days).ffill()
+        .iloc[sampled]
+    )
+    return list(grid.index), {
+        account: [None if np.isnan(value) else value for value in grid[account].tolist()]
+        for account in grid.columns
+    }
@@ -0,0 +1,322 @@
+# account/benchmarks.py
+"""Micro-benchmarks run through ``manage.py benchmark <scenario>``.
+
+Each scenario returns a list of ``(label, seconds, rows)`` results.
+"""
+import locale
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from decimal import Decimal
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from django.test.utils import override_settings
+from trackalytics.startup import import_profile
+from .columnar import EPOCH, ColumnStore, build_store
+from .formatting import format_inr, format_inr_array
+from .models import Transaction
+from .reports import category_analysis, trend_datasets
+from .rollups import monthly_totals
+from .snapshots import read_snapshot, write_snapshot
+from .utils import clean_money, preprocess_transaction_data
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def synthetic_sheet(rows, seed=0):
+    """A register-shaped frame of string cells, like ``read_csv`` hands back."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    amounts = pd.Series(rng.integers(0, 10_000_000, rows) / 100).map("{:,.2f}".format)
+    return pd.DataFrame({
+        'Date': dates.strftime("%m/%d/%Y"),
+        'Income and Expense Account': rng.choice(["HDFC Savings", "SBI", "ICICI Credit"], rows),
+        'Description': "txn",
+        'Category': rng.choice(["[Food]", "[Rent]", "[Salary]", "[Travel]"], rows),
+        'Income Money IN': amounts.where(rng.random(rows) < 0.2),
+        'Expense Money OUT': amounts.where(rng.random(rows) >= 0.2),
+        'Account Balance': amounts,
+    })
+
+
+def legacy_preprocess(df):
+    # The per-cell path that preprocess_transaction_data replaced.
+    df = df[df['Income and Expense Account'].notna() & (df['Income and Expense Account'] != 'Total')].copy()
+    df['Income Money IN'] = df['Income Money IN'].fillna("0").apply(clean_money)
+    df['Expense Money OUT'] = df['Expense Money OUT'].fillna("0").apply(clean_money)
+    df['Account Balance'] = df['Account Balance'].fillna("0").apply(clean_money)
+    df['Date'] = [datetime.strptime(value, "%m/%d/%Y") for value in df['Date']]
+    return df
+
+
+@scenario("preprocess")
+def preprocess_benchmark(rows=1_000_000, repeat=3, **options):
+    df = synthetic_sheet(rows)
+    return [
+        ("apply(clean_money) + strptime", best_of(lambda: legacy_preprocess(df), repeat), rows),
+        ("vectorized", best_of(lambda: preprocess_transaction_data(df), repeat), rows),
+    ]
+
+
+def legacy_trend_datasets(rows, top=10):
+    # The next()-scan that trend_datasets replaced: O(categories x periods x rows).
+    totals = {}
+    for row in rows:
+        totals[row['category']] = totals.get(row['category'], 0) + row['total_out']
+    top_category_names = sorted(totals, key=totals.get, reverse=True)[:top]
+    grouped_data = [row for row in rows if row['category'] in top_category_names]
+    periods = sorted({entry['period'].strftime("%Y-%m") for entry in grouped_data})
+    datasets = []
+    for category in top_category_names:
+        data = []
+        for period in periods:
+            match = next((g['total_out'] for g in grouped_data
+                          if g['category'] == category and g['period'].strftime("%Y-%m") == period), 0)
+            data.append(match)
+        datasets.append({"label": category, "data": data, "fill": False})
+    return periods, datasets
+
+
+def synthetic_trend_rows(periods, categories=40, seed=0):
+    rng = np.random.default_rng(seed)
+    months = pd.date_range("1900-01-01", periods=periods, freq="MS").date
+    return [
+        {'period': month, 'category': f"[Category {category}]", 'total_out': float(amount)}
+        for month in months
+        for category, amount in zip(range(categories), rng.integers(1, 10_000, categories))
+    ]
+
+
+@scenario("trend")
+def trend_benchmark(repeat=3, **options):
+    results = []
+    for periods in (12, 60, 240):
+        rows = synthetic_trend_rows(periods)
+        results.append((f"next() scan, {periods} periods", best_of(lambda: legacy_trend_datasets(rows), repeat), len(rows)))
+    for periods in (12, 60, 240, 1200):
+        rows = synthetic_trend_rows(periods)
+        results.append((f"matrix, {periods} periods", best_of(lambda: trend_datasets(rows, "month"), repeat), len(rows)))
+    return results
+
+
+def legacy_category_analysis(rows, start_date, end_date):
+    # The per-account loop that category_analysis replaced, growing the global frame by concat.
+    df = pd.DataFrame(rows)
+    df = df[df['total_out'] > 0].rename(columns={'total_out': 'money_out'})
+    df['year_month'] = pd.to_datetime(df['month']).dt.to_period('M')
+    all_months = pd.period_range(start=start_date, end=end_date, freq='M')
+    current_month = str(all_months[-1])
+    analysis = {}
+    df_filtered_global = None
+    for account, acc_df in df.groupby('account__name'):
+        monthly = acc_df.groupby(['category', 'year_month'])['money_out'].sum().reset_index()
+        full_index = pd.MultiIndex.from_product([monthly['category'].unique(), all_months],
+                                                names=['category', 'year_month'])
+        monthly_full = monthly.set_index(['category', 'year_month']).reindex(full_index, fill_value=0).reset_index()
+        current = monthly_full[monthly_full['year_month'].astype(str) == current_month]
+        current_dict = dict(zip(current['category'], current['money_out']))
+        avg_dict = (monthly_full.groupby('category')['money_out'].sum() / len(all_months)).to_dict()
+        merged_df = pd.DataFrame({
+            'Category': list(avg_dict.keys()),
+            'Current_Month': [current_dict.get(cat, 0) for cat in avg_dict.keys()],
+            'Average': list(avg_dict.values())
+        }).round(2)
+        analysis[account] = merged_df[merged_df['Current_Month'] > 0]
+        df_filtered = merged_df[['Category', 'Average']]
+        df_filtered_global = df_filtered if df_filtered_global is None else pd.concat(
+            [df_filtered_global, df_filtered], ignore_index=True)
+    return analysis, df_filtered_global.groupby("Category", as_index=False)["Average"].sum()
+
+
+def synthetic_analysis_rows(accounts=50, categories=200, months=12, seed=0):
+    """``monthly_totals(..., paise=True)``-shaped rows for every account x category x month."""
+    rng = np.random.default_rng(seed)
+    month_starts = pd.date_range("2025-01-01", periods=months, freq="MS").date
+    amounts = iter(rng.integers(0, 1_000_000, accounts * categories * months).tolist())
+    return [
+        {'account__name': f"Bank {account}", 'category': f"[Category {category}]",
+         'month': month, 'total_out': next(amounts)}
+        for account in range(accounts)
+        for category in range(categories)
+        for month in month_starts
+    ]
+
+
+@scenario("analysis")
+def analysis_benchmark(repeat=3, **options):
+    start_date, end_date = datetime(2025, 1, 1).date(), datetime(2025, 12, 31).date()
+    results = []
+    for accounts in (10, 50):
+        rows = synthetic_analysis_rows(accounts=accounts)
+        results.append((f"per-account loop, {accounts} accounts",
+                        best_of(lambda: legacy_category_analysis(rows, start_date, end_date), repeat), len(rows)))
+        results.append((f"pivot_table, {accounts} accounts",
+                        best_of(lambda: category_analysis(rows, start_date, end_date), repeat), len(rows)))
+    return results
+
+
+@scenario("startup")
+def startup_benchmark(repeat=3, **options):
+    # "rows" here are the modules loaded by the cold import.
+    seconds, profile = min((import_profile() for _ in range(repeat)), key=lambda run: run[0])
+    return [("import trackalytics.wsgi, trackalytics.urls", seconds, len(profile))]
+
+
+def locale_format_inr(amount):
+    # What views.format_inr did before account.formatting.
+    return f"₹{locale.format_string('%.2f', amount, grouping=True)}"
+
+
+@scenario("inr")
+def inr_benchmark(rows=1_000_000, repeat=3, **options):
+    amounts = pd.Series(np.random.default_rng(0).uniform(-1e8, 1e8, rows))
+    results = []
+    previous = locale.setlocale(locale.LC_NUMERIC)
+    try:
+        locale.setlocale(locale.LC_NUMERIC, 'en_IN.UTF-8')
+    except locale.Error:
+        pass  # Locale not installed; only the replacements are timed.
+    else:
+        results.append(("apply(locale format_inr)", best_of(lambda: amounts.apply(locale_format_inr), repeat), rows))
+    finally:
+        locale.setlocale(locale.LC_NUMERIC, previous)
+    results.append(("apply(format_inr)", best_of(lambda: amounts.apply(format_inr), repeat), rows))
+    results.append(("format_inr_array", best_of(lambda: format_inr_array(amounts), repeat), rows))
+    return results
+
+
+@scenario("money")
+def money_benchmark(rows=1_000_000, repeat=3, **options):
+    """Grouped sums of amounts as float rupees vs int64 paise, in SQLite and pandas."""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'account': rng.integers(0, 50, rows),
+        'category': rng.integers(0, 200, rows),
+        'paise': rng.integers(0, 10_000_000, rows),
+    })
+    frame['rupees'] = frame['paise'] / 100
+
+    connection = sqlite3.connect(":memory:")
+    for column, column_type in (('rupees', 'REAL'), ('paise', 'INTEGER')):
+        connection.execute(f"CREATE TABLE txn_{column} (account INTEGER, category INTEGER, amount {column_type})")
+        connection.executemany(
+            f"INSERT INTO txn_{column} VALUES (?, ?, ?)",
+            frame[['account', 'category', column]].itertuples(index=False, name=None),
+        )
+
+    def grouped_sql(column):
+        return connection.execute(
+            f"SELECT account, category, SUM(amount) FROM txn_{column} GROUP BY account, category"
+        ).fetchall()
+
+    decimals = frame.assign(rupees=[Decimal(int(value)).scaleb(-2) for value in frame['paise']])
+    results = [
+        ("SQL SUM, REAL rupees", best_of(lambda: grouped_sql('rupees'), repeat), rows),
+        ("SQL SUM, INTEGER paise", best_of(lambda: grouped_sql('paise'), repeat), rows),
+        ("pandas groupby, float64 rupees",
+         best_of(lambda: frame.groupby(['account', 'category'])['rupees'].sum(), repeat), rows),
+        ("pandas groupby, int64 paise",
+         best_of(lambda: frame.groupby(['account', 'category'])['paise'].sum(), repeat), rows),
+        ("pandas groupby, object Decimal",
+         best_of(lambda: decimals.groupby(['account', 'category'])['rupees'].sum(), repeat), rows),
+    ]
+    connection.close()
+    return results
+
+
+def synthetic_store(rows, accounts=50, categories=200, days=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return ColumnStore("synthetic", {
+        'id': np.arange(rows, dtype=np.int64),
+        'day': np.sort(rng.integers(0, days, rows)).astype(np.int32) + np.int32(18262),  # from 2020-01-01
+        'account': rng.integers(0, accounts, rows).astype(np.int16),
+        'category': rng.integers(0, categories, rows).astype(np.int16),
+        'money_in': np.where(rng.random(rows) < 0.2, rng.integers(0, 10_000_000, rows), 0),
+        'money_out': rng.integers(0, 10_000_000, rows),
+    }, [f"Bank {i}" for i in range(accounts)], [f"[Category {i}]" for i in range(categories)])
+
+
+@scenario("columnar")
+def columnar_benchmark(rows=1_000_000, repeat=3, **options):
+    """A year of account x category x month totals: SQL GROUP BY and pandas vs the column store.
+
+    When the configured database holds transactions, the ORM report path is
+    also timed against the store built from it.
+    """
+    store = synthetic_store(rows)
+    start_date, end_date = datetime(2024, 1, 1).date(), datetime(2024, 12, 31).date()
+    first, last = ((np.datetime64(day, 'D') - EPOCH).astype(int) for day in (start_date, end_date))
+    frame = pd.DataFrame(store.columns)
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE txn (id INTEGER, day INTEGER, account INTEGER, category INTEGER,"
+                       " money_in INTEGER, money_out INTEGER)")
+    connection.executemany("INSERT INTO txn VALUES (?, ?, ?, ?, ?, ?)", frame.itertuples(index=False, name=None))
+    connection.execute("CREATE INDEX txn_day ON txn (day)")
+
+    def grouped_sql():
+        return connection.execute(
+            "SELECT account, category, strftime('%Y-%m', day * 86400, 'unixepoch'), SUM(money_in), SUM(money_out)"
+            " FROM txn WHERE day BETWEEN ? AND ? GROUP BY 1, 2, 3", (int(first), int(last)),
+        ).fetchall()
+
+    def grouped_pandas():
+        window = frame[frame['day'].between(first, last)]
+        months = (EPOCH + window['day'].to_numpy()).astype('datetime64[M]')
+        return window.groupby(['account', 'category', months])[['money_in', 'money_out']].sum()
+
+    fields = ('account__name', 'category', 'month')
+    results = [
+        ("SQLite GROUP BY", best_of(grouped_sql, repeat), rows),
+        ("pandas groupby", best_of(grouped_pandas, repeat), rows),
+        ("column store group_sum", best_of(lambda: store.group_sum(fields, store.mask(start_date, end_date)), repeat), rows),
+    ]
+    connection.close()
+
+    if Transaction.objects.filter(date__isnull=False).exists():
+        live = build_store()
+        first_day, today = (EPOCH + live['day'][0]).item(), date.today()
+        with override_settings(REPORT_ENGINE="orm"):
+            orm_seconds = best_of(lambda: monthly_totals(first_day, today, fields), repeat)
+        results += [
+            ("ORM monthly_totals, this database", orm_seconds, len(live)),
+            ("column store, this database",
+             best_of(lambda: live.group_sum(fields, live.mask(first_day, today)), repeat), len(live)),
+        ]
+    return results
+
+
+@scenario("snapshot")
+def snapshot_benchmark(rows=1_000_000, repeat=3, **options):
+    """Loading the register from the sheet's CSV (parse + clean) vs from a Parquet snapshot; sizes in the labels."""
+    df = synthetic_sheet(rows)
+    cleaned, _ = preprocess_transaction_data(df)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = Path(directory) / "register.csv"
+        df.to_csv(csv_path, index=False)
+        snapshot = write_snapshot(cleaned, 0, directory)
+        csv_mb, parquet_mb = (path.stat().st_size / 1e6 for path in (csv_path, snapshot))
+        return [
+            (f"CSV read_csv + preprocess, {csv_mb:.1f} MB",
+             best_of(lambda: preprocess_transaction_data(pd.read_csv(csv_path)), repeat), rows),
+            (f"Parquet snapshot read, {parquet_mb:.1f} MB",
+             best_of(lambda: read_snapshot(snapshot), repeat), rows),
+        ]
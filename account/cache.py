@@ -0,0 +1,133 @@
+# account/cache.py
+"""Caching of rendered report pages.
+
+Keys combine the view name, the user, the normalized form parameters and
+the current ``DataVersion``, so an import, or an admin or ORM edit bumping
+it through ``account.signals``, makes every cached report stale at once
+without having to find and delete them.
+"""
+import hashlib
+from datetime import date
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from .models import DataVersion
+
+HITS_KEY = "report-cache:hits"
+MISSES_KEY = "report-cache:misses"
+
+
+def get_report_cache():
+    return caches[settings.REPORT_CACHE_ALIAS]
+
+
+def _incr(key):
+    cache = get_report_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); the metric just loses a count.
+        pass
+
+
+async def _aincr(key):
+    cache = get_report_cache()
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        pass
+
+
+def normalize_params(params):
+    """Sorted ``(name, value)`` pairs with dates as ISO strings and blanks dropped."""
+    return sorted(
+        (name, value.isoformat() if isinstance(value, date) else str(value))
+        for name, value in params.items()
+        if value not in (None, "")
+    )
+
+
+def report_cache_key(name, user, params, version=None):
+    version = DataVersion.current() if version is None else version
+    digest = hashlib.md5(repr(normalize_params(params)).encode(), usedforsecurity=False).hexdigest()
+    return f"report:{name}:v{version}:u{user.pk or 0}:{digest}"
+
+
+def _report_params(request, form_class):
+    """The parameters to key a GET on, or None if the request can't be cached."""
+    if request.method != "GET":
+        return None
+    if form_class is None:
+        return {**request.GET.dict(), "today": date.today()}
+    form = form_class(request.GET or None)
+    return form.cleaned_data if form.is_valid() else None
+
+
+def cached_report(name, form_class=None):
+    """Cache a report view's rendered response per user and parameters.
+
+    With ``form_class`` only valid submissions are cached, keyed on the
+    cleaned data; without it the raw querystring plus today's date is used.
+    Works on sync and async views alike.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                params = _report_params(request, form_class)
+                if params is None:
+                    return await view(request, *args, **kwargs)
+
+                cache = get_report_cache()
+                key = report_cache_key(name, await request.auser(), params, await DataVersion.acurrent())
+                response = await cache.aget(key)
+                if response is not None:
+                    await _aincr(HITS_KEY)
+                    response["X-Report-Cache"] = "hit"
+                    return response
+
+                await _aincr(MISSES_KEY)
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming:
+                    await cache.aset(key, response, settings.REPORT_CACHE_TIMEOUT)
+                response["X-Report-Cache"] = "miss"
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            params = _report_params(request, form_class)
+            if params is None:
+                return view(request, *args, **kwargs)
+
+            cache = get_report_cache()
+            key = report_cache_key(name, request.user, params)
+            response = cache.get(key)
+            if response is not None:
+                _incr(HITS_KEY)
+                response["X-Report-Cache"] = "hit"
+                return response
+
+            _incr(MISSES_KEY)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, response, settings.REPORT_CACHE_TIMEOUT)
+            response["X-Report-Cache"] = "miss"
+            return response
+        return wrapper
+    return decorator
+
+
+def report_cache_stats():
+    cache = get_report_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+        "data_version": DataVersion.current(),
+    }
@@ -0,0 +1,48 @@
+# account/categories.py
+"""The category drop-down of the by-category report.
+
+The list comes from the sheet's ``DROP_DOWN`` tab, read once per sheet
+import and stored as ``Category`` rows. Views read it through
+``category_choices()``, which memoizes it per process until the next
+import bumps ``DataVersion``, so no request waits on the sheet.
+"""
+import threading
+from .models import Category, DataVersion, Transaction
+
+
+def dropdown_categories(df):
+    """Non-blank values of the first column of the ``DROP_DOWN`` tab, in sheet order."""
+    names = df.iloc[:, 0].dropna().astype(str).str.strip()
+    return list(dict.fromkeys(names[names != ""]))
+
+
+def refresh_categories(names):
+    """Replace the stored categories with ``names``."""
+    Category.objects.all().delete()
+    Category.objects.bulk_create([Category(name=name, position=i) for i, name in enumerate(names)])
+
+
+def stored_categories():
+    names = list(Category.objects.values_list('name', flat=True))
+    if names:
+        return names
+    # Nothing imported since the table was added: fall back to the categories in use.
+    return list(
+        Transaction.objects.exclude(category__isnull=True).exclude(category="")
+        .order_by('category').values_list('category', flat=True).distinct()
+    )
+
+
+_memo = None
+_memo_lock = threading.Lock()
+
+
+def category_choices():
+    """The category names for ``SpecificCategoryForm``, cached until the data changes."""
+    global _memo
+    # updated_at as well, since a restored database may reuse a version number.
+    version = DataVersion.objects.filter(pk=1).values_list('version', 'updated_at').first()
+    with _memo_lock:
+        if _memo is None or _memo[0] != version:
+            _memo = (version, stored_categories())
+        return _memo[1]
@@ -0,0 +1,319 @@
+# account/columnar.py
+"""An in-process, column-oriented copy of ``Transaction`` for report queries.
+
+With ``REPORT_ENGINE = "columnar"`` the report totals are computed from
+NumPy arrays instead of SQL. Each column is a ``.npy`` file under
+``COLUMNAR_DIR/<key>/`` and is opened with ``mmap_mode="r"``. Every
+worker process therefore maps the same page-cache pages instead of
+holding its own copy.
+
+Columns, one entry per transaction with a date, sorted by (date, id):
+
+* ``id`` int64 and ``day`` int32, the days since 1970-01-01;
+* ``account`` and ``category``, small-int codes into the lists in ``meta.json``;
+* ``money_in`` and ``money_out`` int64 paise.
+
+The key comes from the ``DataVersion`` row, so an import makes the store
+stale. The importer rebuilds it straight away, and ``get_store`` rebuilds
+it on first use otherwise.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import BigIntegerField, ExpressionWrapper, F
+from django.dispatch import receiver
+from .models import Bank, DataVersion, Transaction
+from .reports import paise_to_rupees
+from .rollups import sort_rows
+
+COLUMNS = ('id', 'day', 'account', 'category', 'money_in', 'money_out')
+GROUP_FIELDS = ('account__name', 'category', 'month')
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+class UnsupportedQuery(ValueError):
+    """A filter or grouping the column store can't answer; callers fall back to SQL."""
+
+
+def _code_dtype(size):
+    return np.int16 if size < 2 ** 15 else np.int32
+
+
+def _objects(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def store_key():
+    current = DataVersion.objects.filter(pk=1).values_list('version', 'updated_at').first()
+    if current is None:
+        return "v0"
+    version, updated_at = current
+    return f"v{version}-{int(updated_at.timestamp() * 1_000_000)}"
+
+
+class ColumnStore:
+    def __init__(self, key, columns, accounts, categories):
+        self.key = key
+        self.columns = columns
+        self.accounts = accounts
+        self.categories = categories
+        self._account_codes = {name: code for code, name in enumerate(accounts)}
+        self._category_codes = {name: code for code, name in enumerate(categories)}
+        # Object arrays, to decode group codes with one take()
+        self._accounts = _objects(accounts)
+        self._categories = _objects(categories)
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        columns = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMNS}
+        return cls(meta["key"], columns, meta["accounts"], meta["categories"])
+
+    def save(self, directory):
+        directory = Path(directory)
+        for name in COLUMNS:
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(self.columns[name]))
+        (directory / "meta.json").write_text(json.dumps({
+            "key": self.key, "rows": len(self), "accounts": self.accounts, "categories": self.categories,
+        }), encoding="utf-8")
+
+    # Queries
+
+    def _lookup_mask(self, window, lookup, value):
+        if lookup == 'account__is_active':
+            column, names = 'account', Bank.objects.filter(is_active=value).values_list('name', flat=True)
+        elif lookup in ('account__name', 'account__name__in'):
+            column, names = 'account', [value] if lookup == 'account__name' else value
+        elif lookup in ('category', 'category__in'):
+            column, names = 'category', [value] if lookup == 'category' else value
+        else:
+            raise UnsupportedQuery(lookup)
+        codes = self._account_codes if column == 'account' else self._category_codes
+        return np.isin(self.columns[column][window], [codes[name] for name in names if name in codes])
+
+    def mask(self, start_date=None, end_date=None, exclude=None, **filters):
+        """Boolean mask of the rows dated within ``[start_date, end_date]`` matching ``filters``.
+
+        ``filters`` and ``exclude`` take ``account__name``, ``category`` (and
+        their ``__in`` forms) and ``account__is_active``.
+        """
+        day = self.columns['day']
+        lo = 0 if start_date is None else np.searchsorted(day, (np.datetime64(start_date, 'D') - EPOCH).astype(int))
+        hi = len(day) if end_date is None else np.searchsorted(
+            day, (np.datetime64(end_date, 'D') - EPOCH).astype(int), side='right',
+        )
+        window = slice(lo, hi)
+        selected = np.ones(hi - lo, dtype=bool)
+        for lookup, value in filters.items():
+            selected &= self._lookup_mask(window, lookup, value)
+        for lookup, value in (exclude or {}).items():
+            selected &= ~self._lookup_mask(window, lookup, value)
+
+        mask = np.zeros(len(day), dtype=bool)
+        mask[window] = selected
+        return mask
+
+    def months(self, rows=slice(None)):
+        """Months since 1970-01 of ``rows``."""
+        return (EPOCH + self.columns['day'][rows]).astype('datetime64[M]').astype(np.int64)
+
+    def group_sum(self, fields, mask):
+        """Sum ``money_in`` and ``money_out`` over the masked rows, grouped by ``fields``.
+
+        Returns ``(groups, totals)``: one decoded tuple per group and a dict
+        of int64 arrays ``total_in``, ``total_out`` and ``txn_count``.
+        """
+        unknown = set(fields) - set(GROUP_FIELDS)
+        if unknown:
+            raise UnsupportedQuery(", ".join(sorted(unknown)))
+        rows = np.flatnonzero(mask)
+        codes = {
+            'account__name': self.columns['account'][rows].astype(np.int64),
+            'category': self.columns['category'][rows].astype(np.int64),
+        }
+        if 'month' in fields:
+            codes['month'] = self.months(rows)
+
+        # One int64 key per row: the field codes in mixed radix.
+        key = np.zeros(len(rows), dtype=np.int64)
+        bounds = []
+        for field in fields:
+            low, high = (int(codes[field].min()), int(codes[field].max())) if len(rows) else (0, 0)
+            bounds.append((field, low, high - low + 1))
+            key = key * (high - low + 1) + (codes[field] - low)
+
+        size = int(key.max()) + 1 if len(rows) else 0
+        if size <= max(4 * len(rows), 1 << 16):
+            # Dense enough to bin directly, skipping the sort in np.unique.
+            counts = np.bincount(key, minlength=size)
+            groups = np.flatnonzero(counts)
+            index = np.zeros(size, dtype=np.int64)
+            index[groups] = np.arange(len(groups))
+            inverse = index[key]
+        else:
+            groups, inverse = np.unique(key, return_inverse=True)
+
+        totals = {
+            # bincount sums in float64, exact for totals below 2**53 paise.
+            'total_in': np.rint(np.bincount(inverse, self.columns['money_in'][rows], len(groups))).astype(np.int64),
+            'total_out': np.rint(np.bincount(inverse, self.columns['money_out'][rows], len(groups))).astype(np.int64),
+            'txn_count': np.bincount(inverse, minlength=len(groups)),
+        }
+
+        decoded = []
+        rest = groups
+        for field, low, radix in reversed(bounds):
+            rest, values = np.divmod(rest, radix)
+            if field == 'account__name':
+                names = self._accounts
+            elif field == 'category':
+                names = self._categories
+            else:
+                names = _objects([date(1970 + month // 12, month % 12 + 1, 1) for month in range(low, low + radix)])
+                low = 0
+            decoded.append(names[values + low].tolist())
+        return list(zip(*reversed(decoded))) if fields else [()] * len(groups), totals
+
+    def top_k(self, column, k, mask):
+        """Row positions of the ``k`` largest ``column`` values among the masked rows, ties by ``-id``."""
+        rows = np.flatnonzero(mask)
+        values = self.columns[column][rows]
+        if len(rows) > k:
+            keep = values >= np.partition(values, len(values) - k)[len(values) - k]
+            rows, values = rows[keep], values[keep]
+        order = np.lexsort((-self.columns['id'][rows], -values))[:k]
+        return rows[order]
+
+
+def build_store(key=None):
+    """Read ``Transaction`` into a new ``ColumnStore`` (not yet saved)."""
+    key = key or store_key()
+    paise = {
+        name: ExpressionWrapper(F(name), output_field=BigIntegerField())
+        for name in ('money_in', 'money_out')
+    }
+    frame = pd.DataFrame.from_records(
+        Transaction.objects.filter(date__isnull=False)
+        .values_list('id', 'date', 'account__name', 'category', paise['money_in'], paise['money_out'])
+        .order_by('date', 'id')
+        .iterator(chunk_size=10_000),
+        columns=['id', 'date', 'account', 'category', 'money_in', 'money_out'],
+    )
+    account, accounts = pd.factorize(frame['account'], use_na_sentinel=False)
+    category, categories = pd.factorize(frame['category'], use_na_sentinel=False)
+
+    columns = {
+        'id': frame['id'].to_numpy(dtype=np.int64),
+        'day': (np.array(frame['date'].tolist(), dtype='datetime64[D]') - EPOCH).astype(np.int32),
+        'account': account.astype(_code_dtype(len(accounts))),
+        'category': category.astype(_code_dtype(len(categories))),
+        'money_in': frame['money_in'].fillna(0).to_numpy(dtype=np.int64),
+        'money_out': frame['money_out'].fillna(0).to_numpy(dtype=np.int64),
+    }
+    return ColumnStore(key, columns, [None if pd.isna(n) else n for n in accounts],
+                       [None if pd.isna(n) else n for n in categories])
+
+
+def write_store(store):
+    """Save ``store`` as ``COLUMNAR_DIR/<key>/`` and drop older stores; returns the directory."""
+    root = Path(settings.COLUMNAR_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    directory = root / store.key
+    if (directory / "meta.json").exists():
+        return directory
+
+    # Write into a scratch directory and rename it into place, so readers
+    # never map a half-written store.
+    scratch = Path(tempfile.mkdtemp(dir=root, prefix=".build-"))
+    store.save(scratch)
+    try:
+        os.replace(scratch, directory)
+    except OSError:
+        shutil.rmtree(scratch, ignore_errors=True)  # another worker got there first
+    for old in root.iterdir():
+        # Unlinking files another process has mapped is safe; its pages stay valid.
+        if old.is_dir() and old.name != store.key and not old.name.startswith(".build-"):
+            shutil.rmtree(old, ignore_errors=True)
+    return directory
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The store for the current data, loaded from disk or rebuilt if missing."""
+    global _store
+    key = store_key()
+    with _store_lock:
+        if _store is None or _store.key != key:
+            directory = Path(settings.COLUMNAR_DIR) / key
+            if not (directory / "meta.json").exists():
+                write_store(build_store(key))
+            _store = ColumnStore.load(directory)
+        return _store
+
+
+def refresh_store():
+    """Rebuild the store after an import."""
+    global _store
+    store = build_store()
+    directory = write_store(store)
+    with _store_lock:
+        _store = ColumnStore.load(directory)
+    return _store
+
+
+@receiver(setting_changed)
+def reset_store(setting, **kwargs):
+    global _store
+    if setting == "COLUMNAR_DIR":
+        with _store_lock:
+            _store = None
+
+
+def monthly_totals(start_date, end_date, fields, exclude=None, order_by=None, paise=False, **filters):
+    """``rollups.monthly_totals`` computed from the column store.
+
+    Raises ``UnsupportedQuery`` for fields or filters it can't answer.
+    """
+    store = get_store()
+    fields = tuple(fields)
+    groups, totals = store.group_sum(fields, store.mask(start_date, end_date, exclude=exclude, **filters))
+    convert = int if paise else paise_to_rupees
+    rows = [
+        dict(zip(fields, group), total_in=convert(total_in), total_out=convert(total_out), txn_count=count)
+        for group, total_in, total_out, count in zip(
+            groups, totals['total_in'].tolist(), totals['total_out'].tolist(), totals['txn_count'].tolist(),
+        )
+    ]
+    return sort_rows(rows, order_by) if order_by else rows
+
+
+def top_debits(start_date, end_date, limit):
+    """Ids of the ``limit`` largest debits per account, in the order of ``top_n_per_group``."""
+    store = get_store()
+    debits = store.mask(start_date, end_date) & (store['money_out'] > 0)
+    accounts = store['account']
+    ids = {}
+    for code in np.unique(accounts[debits]):
+        rows = store.top_k('money_out', limit, debits & (accounts == code))
+        ids[store.accounts[code]] = store['id'][rows].tolist()
+    return ids
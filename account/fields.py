@@ -0,0 +1,46 @@
+# account/fields.py
+from decimal import Decimal, ROUND_HALF_EVEN
+from django import forms
+from django.core import exceptions
+from django.db import models
+
+PAISE = Decimal("0.01")
+
+
+class MoneyField(models.BigIntegerField):
+    """Rupees as a two-place ``Decimal`` in Python, stored as integer paise.
+
+    Sums and comparisons run on exact integers in the database. Floats and
+    Decimals are both accepted on the way in and rounded half to even to
+    the nearest paisa. Aggregates over the column come back as ``Decimal``
+    rupees too; pass ``output_field=BigIntegerField()`` for raw paise.
+    """
+    description = "Amount in rupees, stored as integer paise"
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else Decimal(value).scaleb(-2)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Decimal):
+            return value
+        try:
+            return Decimal(str(value)).quantize(PAISE, rounding=ROUND_HALF_EVEN)
+        except ArithmeticError:
+            raise exceptions.ValidationError(
+                self.error_messages["invalid"], code="invalid", params={"value": value},
+            )
+
+    def get_prep_value(self, value):
+        if value is None or hasattr(value, "resolve_expression"):
+            return value
+        if isinstance(value, float):
+            # Amounts carry at most two decimals, so value * 100 is within
+            # float error of an integer and round() lands on it.
+            return round(value * 100)
+        if isinstance(value, int):
+            return value * 100
+        return int(Decimal(str(value)).scaleb(2).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+    def formfield(self, **kwargs):
+        # Skip IntegerField.formfield, whose bounds are in paise.
+        return models.Field.formfield(self, **{"form_class": forms.DecimalField, "decimal_places": 2, **kwargs})
@@ -0,0 +1,188 @@
+# account/forecast.py
+"""Offline spending forecasts.
+
+``train_forecasts`` fits one model per category and per account on the
+monthly rollups, fanning the fits out over a process pool, and writes the
+fitted models and their predictions under ``FORECAST_DIR/<key>/``. The key
+hashes the ``DataVersion`` and the training window, so an import makes the
+stored forecast stale without deleting it. The forecast view only ever
+reads ``forecast.json``.
+"""
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+import django
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connections
+from django.db.models import BigIntegerField, Sum
+from django.utils import timezone
+from .models import DataVersion, MonthlyCategoryTotal
+from .rollups import month_start
+
+SERIES_KINDS = {
+    "category": "category",
+    "account": "account__name",
+}
+
+
+def fit_prophet(months, values, horizon):
+    """Fit Prophet to a monthly series; returns ``(model_json, predictions)``."""
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    history = pd.DataFrame({"ds": pd.to_datetime(months), "y": values})
+    model = Prophet(
+        yearly_seasonality=len(history) >= 24, weekly_seasonality=False, daily_seasonality=False,
+    )
+    model.fit(history)
+    future = model.make_future_dataframe(periods=horizon, freq="MS", include_history=False)
+    predicted = model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+    return model_to_json(model), [
+        # Spend can't go negative, whatever the trend line says.
+        {"month": ds.date().isoformat(), "yhat": max(yhat, 0.0), "lower": max(lower, 0.0), "upper": max(upper, 0.0)}
+        for ds, yhat, lower, upper in predicted.itertuples(index=False)
+    ]
+
+
+def forecast_key(horizon, today=None):
+    """Directory name for forecasts of the current data over the window ending before ``today``."""
+    today = today or timezone.now().date()
+    raw = f"{DataVersion.current()}:{month_start(today).isoformat()}:{horizon}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def monthly_series(today=None):
+    """Complete months of spend per category and per account, gaps filled with 0.
+
+    Returns ``{(kind, name): pandas.Series}`` indexed by month start. The
+    current month is left out as it is still being filled in.
+    """
+    before = month_start(today or timezone.now().date())
+    rollups = (
+        MonthlyCategoryTotal.objects
+        .filter(month__lt=before, account__is_active=True)
+        .exclude(category='[Transfer]')
+    )
+    series = {}
+    for kind, field in SERIES_KINDS.items():
+        rows = pd.DataFrame.from_records(
+            rollups.values(field, 'month')
+            .annotate(total=Sum('money_out', output_field=BigIntegerField())).order_by(),
+            columns=[field, 'month', 'total'],
+        )
+        if rows.empty:
+            continue
+        spend = rows.pivot_table(index='month', columns=field, values='total', aggfunc='sum', fill_value=0) / 100
+        months = pd.date_range(spend.index.min(), before - relativedelta(months=1), freq="MS").date
+        spend = spend.reindex(months, fill_value=0)
+        for name in spend.columns:
+            column = spend[name]
+            active = column[column > 0]
+            if not active.empty:
+                series[(kind, name)] = column.loc[active.index[0]:]
+    return series
+
+
+def _fit(fit, kind, name, months, values, horizon):
+    try:
+        model_json, predictions = fit(months, values, horizon)
+    except Exception as e:
+        return kind, name, None, str(e)
+    return kind, name, model_json, predictions
+
+
+def _write_json(path, data):
+    # Write-then-rename so readers never see a half-written file.
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def train_forecasts(horizon=None, workers=None, fit=fit_prophet, force=False, today=None):
+    """Fit and store forecasts for the current data unless they already exist.
+
+    Returns ``(key, forecast, trained)``. With ``workers`` of 1 the fits run
+    in this process; otherwise in a pool of that many processes (default:
+    one per CPU).
+    """
+    horizon = horizon or settings.FORECAST_HORIZON
+    today = today or timezone.now().date()
+    key = forecast_key(horizon, today)
+    directory = Path(settings.FORECAST_DIR) / key
+    if not force and (directory / "forecast.json").exists():
+        return key, json.loads((directory / "forecast.json").read_text(encoding="utf-8")), False
+
+    skipped = []
+    jobs = []
+    for (kind, name), values in monthly_series(today).items():
+        if len(values) < settings.FORECAST_MIN_HISTORY:
+            skipped.append({"kind": kind, "name": name, "reason": f"only {len(values)} months of history"})
+            continue
+        jobs.append((kind, name, [month.isoformat() for month in values.index], values.tolist(), horizon))
+
+    if workers == 1:
+        results = [_fit(fit, *job) for job in jobs]
+    else:
+        # Children must not inherit open database connections; spawned ones need Django set up.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            futures = [pool.submit(_fit, fit, *job) for job in jobs]
+            results = [future.result() for future in as_completed(futures)]
+
+    (directory / "models").mkdir(parents=True, exist_ok=True)
+    series = []
+    for kind, name, model_json, predictions in results:
+        if model_json is None:
+            skipped.append({"kind": kind, "name": name, "reason": predictions})
+            continue
+        slug = hashlib.sha1(f"{kind}:{name}".encode()).hexdigest()[:12]
+        (directory / "models" / f"{kind}-{slug}.json").write_text(model_json, encoding="utf-8")
+        series.append({
+            "kind": kind,
+            "name": name,
+            "model": f"models/{kind}-{slug}.json",
+            "total": sum(prediction["yhat"] for prediction in predictions),
+            "predictions": predictions,
+        })
+
+    first = month_start(today)
+    forecast = {
+        "key": key,
+        "data_version": DataVersion.current(),
+        "horizon": horizon,
+        "trained_at": timezone.now().isoformat(),
+        "months": [(first + relativedelta(months=i)).isoformat() for i in range(horizon)],
+        "series": sorted(series, key=lambda item: (item["kind"], -item["total"])),
+        "skipped": skipped,
+    }
+    _write_json(directory / "forecast.json", forecast)
+    _write_json(Path(settings.FORECAST_DIR) / "latest.json", {"key": key})
+    return key, forecast, True
+
+
+def load_forecast(horizon=None, today=None):
+    """Return ``(forecast, stale)`` for the current data, falling back to the
+    last trained forecast (``stale=True``), or ``(None, False)`` if none exists."""
+    root = Path(settings.FORECAST_DIR)
+    current = root / forecast_key(horizon or settings.FORECAST_HORIZON, today) / "forecast.json"
+    if current.exists():
+        return json.loads(current.read_text(encoding="utf-8")), False
+
+    latest = root / "latest.json"
+    if latest.exists():
+        key = json.loads(latest.read_text(encoding="utf-8"))["key"]
+        path = root / key / "forecast.json"
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8")), True
+    return None, False
+
+
+def forecast_months(forecast):
+    return [date.fromisoformat(month) for month in forecast["months"]]
@@ -0,0 +1,70 @@
+# account/formatting.py
+"""Rupee amounts with Indian digit grouping (₹12,34,567.89), without ``locale``.
+
+``format_inr`` formats one number. ``format_inr_array`` formats a whole
+array or Series at once: the digit groups are looked up in precomputed
+tables and joined with NumPy string ops, so no number is formatted in
+Python. Both round half to even and give identical output.
+"""
+import math
+import numpy as np
+import pandas as pd
+
+SYMBOL = "₹"
+
+_PLAIN3 = np.array([str(i) for i in range(1000)])
+_PADDED3 = np.array([f"{i:03d}" for i in range(1000)])
+_PLAIN2 = np.array([f"{i}," for i in range(100)])
+_PADDED2 = np.array([f"{i:02d}," for i in range(100)])
+
+
+def group_indian(digits):
+    """Insert Indian grouping commas into a string of digits: 1234567 -> 12,34,567."""
+    if len(digits) <= 3:
+        return digits
+    head = digits[:-3]
+    lead = len(head) % 2
+    groups = [head[:lead]] if lead else []
+    groups += [head[i:i + 2] for i in range(lead, len(head), 2)]
+    return ",".join(groups) + "," + digits[-3:]
+
+
+def format_inr(amount, decimals=2):
+    """``format_inr(-1234567.5)`` -> ``'-₹12,34,567.50'``; None, NaN and inf give ``''``."""
+    if amount is None or not math.isfinite(amount):
+        return ""
+    scale = 10 ** decimals
+    units = round(abs(amount) * scale)
+    whole, fraction = divmod(units, scale)
+    text = SYMBOL + group_indian(str(whole))
+    if decimals:
+        text += f".{fraction:0{decimals}d}"
+    return "-" + text if amount < 0 and units else text
+
+
+def format_inr_array(values, decimals=2):
+    """``format_inr`` over every element of an array-like.
+
+    Returns a string array, or a Series on the same index when given one.
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    amounts = np.asarray(values, dtype=float)
+    finite = np.isfinite(amounts)
+    scale = 10 ** decimals
+    units = np.rint(np.abs(np.where(finite, amounts, 0.0)) * scale).astype(np.int64)
+
+    whole, fraction = np.divmod(units, scale)
+    rest, last = np.divmod(whole, 1000)
+    text = np.where(rest > 0, _PADDED3[last], _PLAIN3[last])
+    while rest.any():
+        has_group = rest > 0
+        rest, group = np.divmod(rest, 100)
+        prefix = np.where(rest > 0, _PADDED2[group], _PLAIN2[group])
+        text = np.where(has_group, np.char.add(prefix, text), text)
+
+    if decimals:
+        fractions = np.array([f".{i:0{decimals}d}" for i in range(scale)])
+        text = np.char.add(text, fractions[fraction])
+    text = np.char.add(np.where((amounts < 0) & (units > 0), "-" + SYMBOL, SYMBOL), text)
+    text = np.where(finite, text, "")
+    return text if index is None else pd.Series(text, index=index, dtype=object)
@@ -25,12 +25,32 @@ class DateRangeForm(forms.Form):
     start_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
     end_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
 
+class BalanceForm(DateRangeForm):
+    account = forms.CharField(required=False)
+    points = forms.IntegerField(min_value=2, max_value=1000, initial=120, required=False)
+
+class TopTransactionsForm(DateRangeForm):
+    limit = forms.IntegerField(min_value=1, max_value=100, initial=10, required=False)
+
+class CategoryFilterForm(DateRangeForm):
+    category = forms.CharField(required=False)
+
+class TransactionPageForm(CategoryFilterForm):
+    account = forms.CharField()
+    after_amount = forms.DecimalField(decimal_places=2)
+    after_id = forms.IntegerField()
+
 class CategoryTrendForm(forms.Form):
     GROUP_BY_CHOICES = [
+        ("week", "Week"),
         ("month", "Month"),
+        ("quarter", "Quarter"),
         ("year", "Year"),
     ]
 
     start_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
     end_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
-    group_by = forms.ChoiceField(choices=GROUP_BY_CHOICES)
\ No newline at end of file
+    group_by = forms.ChoiceField(choices=GROUP_BY_CHOICES)
+
+class CategorySpendingTrendForm(CategoryTrendForm):
+    top = forms.IntegerField(min_value=1, max_value=50, initial=10, required=False)
@@ -0,0 +1,266 @@
+# account/importer.py
+import os
+import time
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from .balances import refresh_balances
+from .categories import dropdown_categories, refresh_categories
+from .columnar import refresh_store
+from .models import Bank, DataVersion, Transaction
+from .rollups import refresh_monthly_totals
+from .snapshots import read_snapshot, write_snapshot
+from .utils import fetch_google_sheet, preprocess_transaction_data
+
+BATCH_SIZE = 2000
+
+# A row's identity: rows sharing these values are told apart by their order in the sheet.
+KEY_FIELDS = ['date', 'account', 'description', 'category']
+# Everything stored from the sheet; a change in any of these is an update.
+CONTENT_FIELDS = KEY_FIELDS + ['money_in', 'money_out', 'account_balance']
+UPDATE_FIELDS = ['account', 'date', 'description', 'category', 'money_in', 'money_out',
+                 'account_balance', 'fingerprint']
+
+
+def resolve_banks(names):
+    """Return a name -> id map for ``names``, creating any missing banks in one go."""
+    names = list(dict.fromkeys(names))
+    bank_ids = dict(Bank.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in bank_ids]
+    if missing:
+        Bank.objects.bulk_create([Bank(name=name) for name in missing])
+        bank_ids.update(Bank.objects.filter(name__in=missing).values_list('name', 'id'))
+    return bank_ids
+
+
+def _column(df, name, default=''):
+    # Mirrors the old ``row.get(name, default)``; NaN cells are stored as NULL.
+    if name not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    series = df[name]
+    return series.astype(object).where(series.notna(), None)
+
+
+def _hex_hash(frame):
+    # hash_pandas_object uses a fixed key, so the hashes are stable across processes.
+    return pd.util.hash_pandas_object(frame, index=False).map('{:016x}'.format)
+
+
+def normalize_rows(df):
+    """Map a preprocessed sheet onto ``Transaction`` field names and fingerprint every row."""
+    rows = pd.DataFrame({
+        'account': _column(df, 'Income and Expense Account'),
+        'date': df['Date'],
+        'description': _column(df, 'Description'),
+        'category': _column(df, 'Category'),
+        'money_in': df['Income Money IN'],
+        'money_out': df['Expense Money OUT'],
+        'account_balance': df['Account Balance'],
+    }).reset_index(drop=True)
+
+    key_hash = _hex_hash(rows[KEY_FIELDS])
+    occurrence = key_hash.groupby(key_hash).cumcount()
+    rows['sync_key'] = key_hash + '-' + occurrence.astype(str)
+    rows['fingerprint'] = _hex_hash(rows[CONTENT_FIELDS])
+    return rows
+
+
+def build_transactions(rows, bank_ids, ids=None):
+    """Build ``Transaction`` instances column-wise from normalized rows."""
+    columns = zip(
+        ids if ids is not None else [None] * len(rows),
+        rows['account'].map(bank_ids).tolist(),
+        rows['date'].dt.date.tolist(),
+        rows['description'].tolist(),
+        rows['category'].tolist(),
+        rows['money_in'].tolist(),
+        rows['money_out'].tolist(),
+        rows['account_balance'].astype(object).where(rows['account_balance'].notna(), None).tolist(),
+        rows['sync_key'].tolist(),
+        rows['fingerprint'].tolist(),
+    )
+    return [
+        Transaction(
+            id=pk,
+            account_id=account_id,
+            date=txn_date,
+            description=description,
+            category=category,
+            money_in=money_in,
+            money_out=money_out,
+            account_balance=account_balance,
+            sync_key=sync_key,
+            fingerprint=fingerprint,
+        )
+        for pk, account_id, txn_date, description, category, money_in, money_out,
+        account_balance, sync_key, fingerprint in columns
+    ]
+
+
+def no_progress(phase, processed=0, total=0):
+    pass
+
+
+def _write_batches(steps, batch_size, progress):
+    """Run ``(operation, items)`` steps in batches, reporting rows written across all of them."""
+    total = sum(len(items) for _, items in steps)
+    done = 0
+    progress("writing", done, total)
+    for operation, items in steps:
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            operation(batch)
+            done += len(batch)
+            progress("writing", done, total)
+
+
+def _delete(queryset):
+    # Nothing references Transaction, so skip the deletion collector: with the
+    # receivers in account.signals connected it would load and signal every
+    # row, and the importer refreshes the derived tables itself.
+    return queryset._raw_delete(queryset.db)
+
+
+def _reload(rows, bank_ids, batch_size, progress=no_progress):
+    deleted = _delete(Transaction.objects.all())
+    _write_batches([(Transaction.objects.bulk_create, build_transactions(rows, bank_ids))], batch_size, progress)
+    return {"inserted": len(rows), "updated": 0, "deleted": deleted, "unchanged": 0, "months": None}
+
+
+def _sync(rows, bank_ids, batch_size, progress=no_progress):
+    existing = pd.DataFrame.from_records(
+        Transaction.objects.values_list('id', 'sync_key', 'fingerprint', 'date'),
+        columns=['id', 'sync_key', 'fingerprint', 'date'],
+    )
+    # Rows imported before fingerprinting have no key and are replaced wholesale.
+    unkeyed = existing['sync_key'].isna()
+    unkeyed_ids = existing.loc[unkeyed, 'id'].tolist()
+    old_dates = existing.loc[unkeyed, 'date'].tolist()
+    existing = existing.dropna(subset=['sync_key']).set_index('sync_key')
+    incoming = rows.set_index('sync_key', drop=False)
+
+    new_keys = incoming.index.difference(existing.index)
+    gone_keys = existing.index.difference(incoming.index)
+    common = incoming.index.intersection(existing.index)
+    changed_keys = common[incoming.loc[common, 'fingerprint'].values != existing.loc[common, 'fingerprint'].values]
+
+    delete_ids = unkeyed_ids + existing.loc[gone_keys, 'id'].tolist()
+    # Months whose rollups are affected, both before and after the change.
+    old_dates += existing.loc[gone_keys.union(changed_keys), 'date'].tolist()
+    new_dates = incoming.loc[new_keys.union(changed_keys), 'date'].dt.date.tolist()
+    months = sorted({day.replace(day=1) for day in old_dates + new_dates if day is not None})
+
+    _write_batches([
+        (lambda ids: _delete(Transaction.objects.filter(id__in=ids)), delete_ids),
+        (Transaction.objects.bulk_create, build_transactions(incoming.loc[new_keys], bank_ids)),
+        (lambda objs: Transaction.objects.bulk_update(objs, UPDATE_FIELDS),
+         build_transactions(incoming.loc[changed_keys], bank_ids, existing.loc[changed_keys, 'id'].tolist())),
+    ], batch_size, progress)
+    return {
+        "inserted": len(new_keys),
+        "updated": len(changed_keys),
+        "deleted": len(delete_ids),
+        "unchanged": len(common) - len(changed_keys),
+        "months": months,
+    }
+
+
+def import_transactions(df, incremental=False, batch_size=BATCH_SIZE, progress=no_progress,
+                        preprocessed=False, snapshot=False, categories=None):
+    """Load the rows of a raw sheet DataFrame into ``Transaction``.
+
+    A full reload replaces every row; an incremental sync diffs the sheet
+    against the stored fingerprints and only writes what changed, refreshing
+    the monthly rollups of just the months it touched. Either way
+    the work runs in a single atomic transaction, so a failure leaves the
+    previous data untouched. Returns a dict of row counts and throughput.
+
+    ``progress(phase, processed, total)`` is called as the import moves
+    through parsing, writing (once per batch), the rollup refresh and the
+    running balance rebuild.
+
+    ``preprocessed=True`` takes an already cleaned frame, such as a
+    snapshot. ``snapshot=True`` writes the cleaned frame to a new snapshot
+    once the import has committed, and records its path as ``snapshot``.
+    ``categories`` replaces the stored drop-down categories in the same
+    transaction.
+    """
+    started = time.perf_counter()
+    progress("parsing", 0, len(df))
+    if preprocessed:
+        rejected = pd.DataFrame(columns=['row', 'column', 'value'])
+    else:
+        df, rejected = preprocess_transaction_data(df)
+    rows = normalize_rows(df)
+
+    with transaction.atomic():
+        bank_ids = resolve_banks(rows['account'].tolist())
+        apply = _sync if incremental else _reload
+        result = apply(rows, bank_ids, batch_size, progress)
+        progress("rollups")
+        refresh_monthly_totals(result["months"])
+        progress("balances")
+        refresh_balances(rows, bank_ids, batch_size)
+        if categories is not None:
+            refresh_categories(categories)
+        DataVersion.bump()
+
+    if settings.REPORT_ENGINE == "columnar":
+        progress("columnar")
+        refresh_store()
+
+    if snapshot:
+        progress("snapshot")
+        try:
+            result["snapshot"] = str(write_snapshot(df, DataVersion.current()))
+        except (ImportError, OSError, ValueError, TypeError, NotImplementedError) as e:
+            # The import itself has committed; a missing snapshot is only reported.
+            # pyarrow's ArrowInvalid, ArrowTypeError and ArrowNotImplementedError
+            # subclass the last three.
+            result["snapshot"] = None
+            result["snapshot_error"] = str(e)
+
+    seconds = time.perf_counter() - started
+    result.update({
+        "rows": len(rows),
+        "incremental": incremental,
+        "rejected": rejected.to_dict('records'),
+        "seconds": seconds,
+        "rows_per_second": len(rows) / seconds if seconds else 0.0,
+    })
+    return result
+
+
+def import_from_sheet(sheet_id, sheet_name, incremental=False, progress=no_progress):
+    progress("fetching")
+    df = fetch_google_sheet(sheet_id, sheet_name, max_age=0)
+    categories, categories_error = None, None
+    dropdown = os.environ.get("DROP_DOWN")
+    if dropdown:
+        try:
+            categories = dropdown_categories(fetch_google_sheet(sheet_id, dropdown, None, max_age=0))
+        except ValueError as e:
+            # Keep the stored categories rather than fail the import over the drop-down.
+            categories_error = str(e)
+    result = import_transactions(df, incremental=incremental, progress=progress, snapshot=True,
+                                 categories=categories)
+    if categories_error:
+        result["categories_error"] = categories_error
+    return result
+
+
+def import_snapshot(path, incremental=False, progress=no_progress):
+    """Restore ``Transaction`` from a snapshot file (or the newest one in a directory)."""
+    progress("reading")
+    df = read_snapshot(path)
+    return import_transactions(df, incremental=incremental, progress=progress, preprocessed=True)
+
+
+def import_summary(result):
+    mode = "Synced" if result["incremental"] else "Imported"
+    return (
+        f"✅ {mode} {result['rows']} transactions in {result['seconds']:.2f}s "
+        f"({result['rows_per_second']:.0f} rows/s): {result['inserted']} inserted, "
+        f"{result['updated']} updated, {result['deleted']} deleted, {result['unchanged']} unchanged, "
+        f"{len(result['rejected'])} rejected."
+    )
@@ -0,0 +1,174 @@
+# account/jobs.py
+"""Background sheet imports.
+
+Web requests only queue an ``ImportJob``; the ``run_import_worker`` command
+claims and runs them one at a time. The partial unique constraint on
+running jobs is the lock, so a second worker (or a second click) can never
+start an import while one is in flight.
+
+Progress and a heartbeat are written to the job row by ``JobReporter``
+from its own thread. That thread has its own database connection, so its
+updates commit while the import's transaction is still open. A running
+job whose heartbeat stops is failed by the next worker.
+
+On SQLite this only holds outside the write phase. SQLite lets one
+connection write at a time, and the import keeps its write lock from the
+first row written until it commits. While it holds it, the status partial
+stays on the last phase reported before it ("parsing"), and the heartbeat
+pauses. Keep ``IMPORT_JOB_TIMEOUT`` above the longest write phase, or use
+PostgreSQL for live per-batch progress.
+"""
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, OperationalError, connection, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .importer import import_from_sheet, import_summary
+from .models import ImportJob
+
+
+def enqueue_import(sheet_id, sheet_name, incremental=False, user=None):
+    """Queue an import, reusing an identical job that is still waiting."""
+    job = ImportJob.objects.filter(
+        status=ImportJob.QUEUED, sheet_id=sheet_id, sheet_name=sheet_name, incremental=incremental,
+    ).first()
+    if job is not None:
+        return job
+    return ImportJob.objects.create(
+        sheet_id=sheet_id,
+        sheet_name=sheet_name,
+        incremental=incremental,
+        requested_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def fail_stale_jobs(timeout=None):
+    """Fail running jobs without a heartbeat for ``IMPORT_JOB_TIMEOUT`` seconds, releasing the lock."""
+    timeout = settings.IMPORT_JOB_TIMEOUT if timeout is None else timeout
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return ImportJob.objects.alias(
+        last_seen=Coalesce('heartbeat_at', 'started_at'),
+    ).filter(status=ImportJob.RUNNING, last_seen__lt=cutoff).update(
+        status=ImportJob.FAILED,
+        phase='done',
+        message="❌ The import timed out; the worker running it may have stopped.",
+        finished_at=timezone.now(),
+    )
+
+
+def claim_next_job():
+    """Mark the oldest queued job as running and return it, or None if none is
+    queued or another import is already running."""
+    fail_stale_jobs()
+    with transaction.atomic():
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ImportJob.QUEUED).order_by('created_at', 'id').first()
+        )
+        if job is None:
+            return None
+        job.status = ImportJob.RUNNING
+        job.phase = 'starting'
+        job.started_at = job.heartbeat_at = timezone.now()
+        try:
+            with transaction.atomic():
+                job.save(update_fields=['status', 'phase', 'started_at', 'heartbeat_at'])
+        except IntegrityError:
+            return None
+    return job
+
+
+class JobReporter:
+    """The ``progress`` callback of a running job, written to its row from a background thread.
+
+    The thread writes the latest progress as it arrives, and a heartbeat at
+    least every ``IMPORT_JOB_HEARTBEAT`` seconds, on its own connection.
+    SQLite refuses that write while the import's transaction holds the
+    write lock; the update is then retried on the next beat.
+    """
+
+    def __init__(self, job, interval=None):
+        self.job_id = job.pk
+        self.interval = settings.IMPORT_JOB_HEARTBEAT if interval is None else interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=f"import-job-{job.pk}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self._stopped = True
+        self._wake.set()
+        self._thread.join()
+
+    def __call__(self, phase, processed=0, total=0):
+        with self._lock:
+            self._pending = {"phase": phase, "rows_processed": processed, "rows_total": total}
+        self._wake.set()
+
+    def _run(self):
+        try:
+            while True:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                with self._lock:
+                    if self._stopped:
+                        return
+                    fields, self._pending = self._pending, {}
+                self.write(fields)
+        finally:
+            connection.close()
+
+    def write(self, fields):
+        try:
+            ImportJob.objects.filter(pk=self.job_id, status=ImportJob.RUNNING).update(
+                heartbeat_at=timezone.now(), **fields,
+            )
+        except OperationalError:
+            with self._lock:
+                self._pending = self._pending or fields
+
+
+def run_job(job):
+    """Run a claimed job to completion, recording its outcome on the row."""
+    try:
+        with JobReporter(job) as report:
+            result = import_from_sheet(job.sheet_id, job.sheet_name, incremental=job.incremental, progress=report)
+    except Exception as e:
+        job.status = ImportJob.FAILED
+        job.message = str(e)
+    else:
+        job.status = ImportJob.SUCCEEDED
+        job.message = import_summary(result)
+        job.rows_processed = job.rows_total = result["rows"]
+        job.result = result
+    job.phase = 'done'
+    job.finished_at = timezone.now()
+    try:
+        with transaction.atomic():
+            job.save()
+    except (ValueError, TypeError, DatabaseError) as e:
+        # A result the database won't store must not leave the job running.
+        job.result = None
+        job.message = f"{job.message}\n⚠️ The import result could not be saved: {e}"
+        job.save()
+    return job
+
+
+def run_pending_jobs():
+    """Run queued jobs until none are left; returns the jobs that ran."""
+    finished = []
+    while (job := claim_next_job()) is not None:
+        finished.append(run_job(job))
+    return finished
+
+
+def job_progress(job):
+    """``{"phase", "processed", "total"}`` for ``job``, as last written by its worker."""
+    return {"phase": job.phase, "processed": job.rows_processed, "total": job.rows_total}
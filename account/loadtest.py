@@ -0,0 +1,161 @@
+# account/loadtest.py
+"""In-process load test of the report endpoints, run with ``manage.py loadtest``.
+
+Requests go straight to Django's ``WSGIHandler`` (from a thread pool) and
+``ASGIHandler`` (as asyncio tasks), with no server or sockets in between.
+The two numbers therefore compare how the sync and async request paths
+handle concurrent report traffic, not how fast gunicorn or uvicorn are.
+"""
+import asyncio
+import io
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import urlsplit
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import reverse
+
+REPORT_URLS = ("category_summary", "transaction", "income", "trend", "saving")
+
+
+def default_paths(today=None):
+    """The async report endpoints, each over the last year by month."""
+    end = today or date.today()
+    # group_by is required by the income and trend forms; the others ignore it.
+    query = f"start_date={end - relativedelta(years=1)}&end_date={end}&group_by=month"
+    return [f"{reverse(name)}?{query}" for name in REPORT_URLS]
+
+
+def default_host():
+    return next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host and host != "*"), "localhost")
+
+
+def session_cookie(user):
+    """A ``Cookie`` header value logging requests in as ``user``."""
+    from importlib import import_module
+
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
+
+
+def summarize(interface, started, results):
+    """``results`` is a list of ``(status, seconds)``, one per request."""
+    elapsed = time.perf_counter() - started
+    latencies = sorted(seconds for _, seconds in results)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "interface": interface,
+        "requests": len(results),
+        "seconds": elapsed,
+        "rps": len(results) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "statuses": dict(Counter(status for status, _ in results)),
+    }
+
+
+def run_wsgi(paths, requests, concurrency, host="localhost", cookie=None):
+    handler = WSGIHandler()
+
+    def call(path):
+        url = urlsplit(path)
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "SERVER_NAME": host,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": host,
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        if cookie:
+            environ["HTTP_COOKIE"] = cookie
+        status = []
+        started = time.perf_counter()
+        response = handler(environ, lambda line, headers, exc_info=None: status.append(int(line.split()[0])))
+        try:
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return status[0], time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest") as executor:
+        results = list(executor.map(call, (paths[i % len(paths)] for i in range(requests))))
+    return summarize("wsgi", started, results)
+
+
+async def _run_asgi(paths, requests, concurrency, host, cookie):
+    handler = ASGIHandler()
+    slots = asyncio.Semaphore(concurrency)
+    headers = [(b"host", host.encode())]
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+
+    async def call(path):
+        url = urlsplit(path)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "server": (host, 80),
+            "client": ("127.0.0.1", 0),
+        }
+        body_sent = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # The client never disconnects; the handler cancels this wait when it's done.
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        status = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        async with slots:
+            started = time.perf_counter()
+            await handler(scope, receive, send)
+            return status[0], time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(call(paths[i % len(paths)]) for i in range(requests)))
+    return summarize("asgi", started, results)
+
+
+def run_asgi(paths, requests, concurrency, host="localhost", cookie=None):
+    return asyncio.run(_run_asgi(paths, requests, concurrency, host, cookie))
@@ -0,0 +1,30 @@
+# account/management/commands/benchmark.py
+
+from django.core.management.base import BaseCommand, CommandError
+from account.benchmarks import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = "Run the account micro-benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="*", help=f"One or more of: {', '.join(SCENARIOS)}")
+        parser.add_argument("--rows", type=int, help="Size of the synthetic data set.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best time is kept.")
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        kwargs = {key: value for key, value in options.items() if value is not None}
+        for name in names:
+            self.stdout.write(f"== {name}")
+            results = SCENARIOS[name](**kwargs)
+            baseline = results[0][1]
+            for label, seconds, rows in results:
+                self.stdout.write(
+                    f"  {label:<40} {seconds * 1000:>10.1f} ms {rows / seconds:>14,.0f} rows/s"
+                    f" {baseline / seconds:>7.1f}x"
+                )
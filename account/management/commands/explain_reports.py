@@ -0,0 +1,82 @@
+# account/management/commands/explain_reports.py
+
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from account.models import Transaction
+from account.queries import top_n_per_group
+from account.rollups import monthly_totals_querysets, weekly_totals_queryset
+from account.views import TRANSACTION_FIELDS, TRANSACTION_PAGE_SIZE, category_debits
+
+
+def report_querysets(start_date, end_date):
+    """The queries each report view runs for ``[start_date, end_date]``, by view name."""
+    one_year_ago = end_date - relativedelta(years=1)
+    debits = category_debits(start_date, end_date)
+    return {
+        "category_summary": [
+            queryset.order_by('account__name', '-total_out')
+            for queryset in monthly_totals_querysets(start_date, end_date, ('account__name', 'category'))
+        ],
+        "transaction_summary": [
+            top_n_per_group(debits.select_related('account'), ['account__name'], ['-money_out', '-id'], 10),
+        ],
+        "transaction_summary_by_category": [
+            top_n_per_group(debits.values(*TRANSACTION_FIELDS), ['account__name'], ['-money_out', '-id'],
+                            TRANSACTION_PAGE_SIZE + 1),
+            category_debits(start_date, end_date, "[Food]").filter(
+                Q(money_out__lt=1000) | Q(money_out=1000, id__lt=1000), account__name="HDFC Savings",
+            ).order_by('-money_out', '-id').values(*TRANSACTION_FIELDS)[:TRANSACTION_PAGE_SIZE + 1],
+        ],
+        "income_summary": monthly_totals_querysets(start_date, end_date, ('month',), category="[Salary]") + [
+            weekly_totals_queryset(start_date, end_date, category="[Salary]"),
+        ],
+        "category_spending_trend": monthly_totals_querysets(start_date, end_date, ('month', 'category')) + [
+            weekly_totals_queryset(start_date, end_date, ('category',)),
+        ],
+        "account_category_analysis": monthly_totals_querysets(
+            one_year_ago, end_date, ('account__name', 'category', 'month'),
+            exclude={'category__in': ['[Transfer]']}, account__is_active=True,
+        ) + [
+            Transaction.objects.filter(account__name="HDFC Savings", category="[Salary]").order_by('-date')[:1],
+        ],
+    }
+
+
+def explain(queryset, **options):
+    # QuerySet.explain() cannot wrap the subquery Django emits for filters on
+    # window functions, so prefix the compiled SQL directly.
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix(**options)} {sql}", params)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    help = "Print the EXPLAIN plan of every query behind the report views."
+
+    def add_arguments(self, parser):
+        today = date.today()
+        parser.add_argument("reports", nargs="*", help="Limit the output to these views.")
+        parser.add_argument("--start", type=date.fromisoformat, default=today - relativedelta(years=1, days=-15),
+                            help="Range start (YYYY-MM-DD); mid-month by default so rollup edges are included.")
+        parser.add_argument("--end", type=date.fromisoformat, default=today)
+        parser.add_argument("--analyze", action="store_true",
+                            help="Run the queries and show actual timings (PostgreSQL EXPLAIN ANALYZE).")
+
+    def handle(self, *args, **options):
+        reports = report_querysets(options["start"], options["end"])
+        names = options["reports"] or list(reports)
+        unknown = set(names) - set(reports)
+        if unknown:
+            raise CommandError(f"Unknown report(s): {', '.join(sorted(unknown))}")
+
+        explain_options = {"analyze": True} if options["analyze"] and connection.vendor == "postgresql" else {}
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {name}"))
+            for queryset in reports[name]:
+                self.stdout.write(str(queryset.query))
+                self.stdout.write(explain(queryset, **explain_options))
+                self.stdout.write("")
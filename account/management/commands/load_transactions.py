@@ -1,40 +1,44 @@
 # account/management/commands/load_transactions.py
 
 from django.core.management.base import BaseCommand
-from account.models import Transaction, Bank
-from account.utils import fetch_google_sheet, preprocess_transaction_data
-from datetime import datetime
+from account.importer import import_from_sheet, import_snapshot, import_summary
 import os
 
 class Command(BaseCommand):
-
-    def __init__(self):
+    help = "Reload all transactions from the Google Sheet register, or from a saved snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only insert, update and delete rows that changed since the last import.",
+        )
+        parser.add_argument(
+            "--from-snapshot",
+            metavar="PATH",
+            help="Restore from a Parquet snapshot instead of the sheet; a directory means its newest snapshot.",
+        )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.sheet_id = os.environ.get("SHEET_ID")
         self.sheet_name = os.environ.get("TRANSACTION_SHEET_NAME")
 
     def handle(self, *args, **kwargs):
 
         try:
-            df = fetch_google_sheet(self.sheet_id, self.sheet_name)
+            if kwargs["from_snapshot"]:
+                result = import_snapshot(kwargs["from_snapshot"], incremental=kwargs["incremental"])
+            else:
+                result = import_from_sheet(self.sheet_id, self.sheet_name, incremental=kwargs["incremental"])
         except ValueError as e:
-            print(e)
+            self.stderr.write(str(e))
             return
 
-        Transaction.objects.all().delete()
-
-        df = preprocess_transaction_data(df)
-
-        for _, row in df.iterrows():
-            bank_obj, _ = Bank.objects.get_or_create(name=row['Income and Expense Account'])
-
-            Transaction.objects.create(
-                account=bank_obj,
-                date=datetime.strptime(row['Date'], "%m/%d/%Y"),
-                description=row.get('Description', ''),
-                category=row.get('Category', ''),
-                money_in=row['Income Money IN'],
-                money_out=row['Expense Money OUT'],
-                account_balance=row['Account Balance']
-            )
-
-        print("✅ Transactions imported successfully.")
+        self.stdout.write(import_summary(result))
+        if result.get("snapshot"):
+            self.stdout.write(f"Snapshot saved to {result['snapshot']}")
+        elif "snapshot_error" in result:
+            self.stderr.write(f"Snapshot not saved: {result['snapshot_error']}")
+        for rejection in result["rejected"]:
+            self.stderr.write(f"Rejected row {rejection['row']}: {rejection['column']} = {rejection['value']!r}")
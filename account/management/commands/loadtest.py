@@ -0,0 +1,46 @@
+# account/management/commands/loadtest.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from account.loadtest import default_host, default_paths, run_asgi, run_wsgi, session_cookie
+
+
+class Command(BaseCommand):
+    help = "Compare ASGI and WSGI throughput on the report endpoints, in-process."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per interface.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once.")
+        parser.add_argument("--interface", choices=["asgi", "wsgi", "both"], default="both")
+        parser.add_argument("--path", action="append", dest="paths",
+                            help="Path with querystring to request; repeatable. Defaults to the report views.")
+        parser.add_argument("--user", help="Username to send the requests as.")
+        parser.add_argument("--cache", action="store_true",
+                            help="Keep the report cache on; by default every request renders.")
+
+    def handle(self, *args, **options):
+        cookie = None
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get_by_natural_key(options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user {options['user']!r}.")
+            cookie = session_cookie(user)
+
+        paths = options["paths"] or default_paths()
+        runners = {"wsgi": run_wsgi, "asgi": run_asgi}
+        interfaces = list(runners) if options["interface"] == "both" else [options["interface"]]
+        overrides = {} if options["cache"] else {"REPORT_CACHE_TIMEOUT": 0}
+
+        with override_settings(**overrides):
+            for interface in interfaces:
+                result = runners[interface](
+                    paths, options["requests"], options["concurrency"], host=default_host(), cookie=cookie,
+                )
+                statuses = " ".join(f"{status}×{count}" for status, count in sorted(result["statuses"].items()))
+                self.stdout.write(
+                    f"  {interface:<5} {result['requests']:>6} req {result['seconds']:>8.2f} s"
+                    f" {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.1f} ms"
+                    f"  p95 {result['p95_ms']:>8.1f} ms  [{statuses}]"
+                )
@@ -0,0 +1,18 @@
+# account/management/commands/refresh_savings.py
+
+from django.core.management.base import BaseCommand
+from account.savings import refresh_savings
+import os
+
+class Command(BaseCommand):
+    help = "Fetch the savings tabs of the Google Sheet and store them for the savings page; meant for cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=float, help="Seconds to wait for each tab.")
+
+    def handle(self, *args, **kwargs):
+        for tab in refresh_savings(os.environ.get("SHEET_ID"), timeout=kwargs["timeout"]):
+            if tab["error"]:
+                self.stderr.write(f"❌ {tab['saving_type']}: {tab['error']} ({tab['seconds']:.2f}s)")
+            else:
+                self.stdout.write(f"✅ {tab['saving_type']}: {len(tab['rows'])} rows ({tab['seconds']:.2f}s)")
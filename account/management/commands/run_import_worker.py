@@ -0,0 +1,36 @@
+# account/management/commands/run_import_worker.py
+
+import time
+from django.core.management.base import BaseCommand
+from account.jobs import claim_next_job, run_job
+from account.models import ImportJob
+
+class Command(BaseCommand):
+    help = "Run queued sheet imports, one at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are queued now and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls for new jobs.",
+        )
+
+    def handle(self, *args, **kwargs):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if kwargs["once"]:
+                    return
+                time.sleep(kwargs["interval"])
+                continue
+
+            self.stdout.write(f"Running import #{job.pk}")
+            run_job(job)
+            write = self.stdout.write if job.status == ImportJob.SUCCEEDED else self.stderr.write
+            write(f"Import #{job.pk}: {job.message}")
@@ -0,0 +1,24 @@
+# account/management/commands/train_forecasts.py
+
+from django.core.management.base import BaseCommand
+from account.forecast import train_forecasts
+
+class Command(BaseCommand):
+    help = "Fit spending forecasts per category and account, reusing them while the data is unchanged."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horizon", type=int, help="Months to forecast, starting with the current one.")
+        parser.add_argument("--workers", type=int, help="Processes to fit in; defaults to one per CPU.")
+        parser.add_argument("--force", action="store_true", help="Refit even if forecasts for this data exist.")
+
+    def handle(self, *args, **kwargs):
+        key, forecast, trained = train_forecasts(
+            horizon=kwargs["horizon"], workers=kwargs["workers"], force=kwargs["force"],
+        )
+        if not trained:
+            self.stdout.write(f"Forecasts {key} are up to date.")
+            return
+
+        self.stdout.write(f"Trained {len(forecast['series'])} forecasts into {key}.")
+        for skipped in forecast["skipped"]:
+            self.stderr.write(f"Skipped {skipped['kind']} {skipped['name']}: {skipped['reason']}")
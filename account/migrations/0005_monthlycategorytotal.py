@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0004_transaction_sync_key_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCategoryTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, null=True)),
+                ('month', models.DateField()),
+                ('money_in', models.FloatField(default=0)),
+                ('money_out', models.FloatField(default=0)),
+                ('txn_count', models.PositiveIntegerField(default=0)),
+                ('account', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='account.bank')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month', 'account', 'category'], name='account_mon_month_f6599a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0005_monthlycategorytotal'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['date', 'account'], name='txn_date_account_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['category', 'date'], name='txn_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('money_out__gt', 0)), fields=['date', 'account', 'money_out'], name='txn_debit_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('money_out__gt', 0)), fields=['account', '-money_out', '-id'], name='txn_debit_account_amount_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:24
+
+import account.fields
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Round
+
+MONEY_FIELDS = {
+    'Transaction': ['money_in', 'money_out', 'account_balance'],
+    'MonthlyCategoryTotal': ['money_in', 'money_out'],
+}
+
+
+def rupees_to_paise(apps, schema_editor):
+    # Scale while the columns are still floats, so no paise are lost to the integer cast.
+    for model_name, fields in MONEY_FIELDS.items():
+        model = apps.get_model('account', model_name)
+        model.objects.update(**{field: Round(F(field) * 100) for field in fields})
+
+
+def paise_to_rupees(apps, schema_editor):
+    for model_name, fields in MONEY_FIELDS.items():
+        model = apps.get_model('account', model_name)
+        model.objects.update(**{field: F(field) / 100.0 for field in fields})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0008_importjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(rupees_to_paise, paise_to_rupees),
+        migrations.AlterField(
+            model_name='monthlycategorytotal',
+            name='money_in',
+            field=account.fields.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='monthlycategorytotal',
+            name='money_out',
+            field=account.fields.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='account_balance',
+            field=account.fields.MoneyField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='money_in',
+            field=account.fields.MoneyField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='money_out',
+            field=account.fields.MoneyField(blank=True, null=True),
+        ),
+    ]
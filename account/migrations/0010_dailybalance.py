@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:26
+
+import account.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0009_money_as_paise'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('balance', account.fields.MoneyField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='balance_mismatch',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('balance_mismatch', True)), fields=['account', 'date'], name='txn_balance_mismatch_idx'),
+        ),
+        migrations.AddField(
+            model_name='dailybalance',
+            name='account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='account.bank'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailybalance',
+            constraint=models.UniqueConstraint(fields=('account', 'date'), name='unique_daily_balance'),
+        ),
+    ]
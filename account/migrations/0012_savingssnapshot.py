@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:46
+
+import account.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0011_category'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavingsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('saving_type', models.CharField(unique=True)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('columns', models.JSONField(default=list)),
+                ('rows', models.JSONField(default=list)),
+                ('minimum', account.fields.MoneyField(default=0)),
+                ('maximum', account.fields.MoneyField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('seconds', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+    ]
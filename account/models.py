@@ -1,4 +1,9 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
+from .fields import MoneyField
 
 # Create your models here.
 class Bank(models.Model):
@@ -13,6 +18,155 @@ class Transaction(models.Model):
     date = models.DateField(null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     category = models.CharField(null=True, blank=True)
-    money_in = models.FloatField(null=True, blank=True)
-    money_out = models.FloatField(null=True, blank=True)
-    account_balance = models.FloatField(null=True, blank=True)
\ No newline at end of file
+    money_in = MoneyField(null=True, blank=True)
+    money_out = MoneyField(null=True, blank=True)
+    account_balance = MoneyField(null=True, blank=True)
+    sync_key = models.CharField(max_length=40, null=True, blank=True, db_index=True)
+    fingerprint = models.CharField(max_length=16, null=True, blank=True)
+    # The sheet's account_balance disagrees with the running balance computed on import
+    balance_mismatch = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Date-range reports, grouped or filtered by account
+            models.Index(fields=['date', 'account'], name='txn_date_account_idx'),
+            # Category filters ([Salary] income, category listing) within a date range
+            models.Index(fields=['category', 'date'], name='txn_category_date_idx'),
+            # Debits only: trend, top-N and category listing all filter money_out > 0
+            models.Index(
+                fields=['date', 'account', 'money_out'],
+                condition=models.Q(money_out__gt=0),
+                name='txn_debit_date_idx',
+            ),
+            # Keyset pages of one account's debits ordered by (-money_out, -id)
+            models.Index(
+                fields=['account', '-money_out', '-id'],
+                condition=models.Q(money_out__gt=0),
+                name='txn_debit_account_amount_idx',
+            ),
+            models.Index(
+                fields=['account', 'date'],
+                condition=models.Q(balance_mismatch=True),
+                name='txn_balance_mismatch_idx',
+            ),
+        ]
+
+class MonthlyCategoryTotal(models.Model):
+    """Per account x category x month sums of ``Transaction``, maintained by the importer and ``account.signals``."""
+    account = models.ForeignKey(Bank, blank=True, null=True, on_delete=models.CASCADE)
+    category = models.CharField(null=True, blank=True)
+    month = models.DateField()
+    money_in = MoneyField(default=0)
+    money_out = MoneyField(default=0)
+    txn_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['month', 'account', 'category'])]
+
+
+class DailyBalance(models.Model):
+    """An account's closing balance on each day it had transactions, maintained by the importer and ``account.signals``."""
+    account = models.ForeignKey(Bank, on_delete=models.CASCADE)
+    date = models.DateField()
+    balance = MoneyField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['account', 'date'], name='unique_daily_balance')]
+
+
+class Category(models.Model):
+    """A category of the sheet's drop-down list, in sheet order; refreshed by every sheet import."""
+    name = models.CharField(unique=True)
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+        verbose_name_plural = 'categories'
+
+    def __str__(self):
+        return self.name
+
+
+class SavingsSnapshot(models.Model):
+    """One savings tab of the sheet as last fetched by ``manage.py refresh_savings``."""
+    saving_type = models.CharField(unique=True)
+    position = models.PositiveIntegerField(default=0)
+    columns = models.JSONField(default=list)
+    rows = models.JSONField(default=list)
+    minimum = MoneyField(default=0)
+    maximum = MoneyField(default=0)
+    # The last refresh that loaded the tab; ``error`` is set when the latest one failed.
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    seconds = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['position']
+
+    def __str__(self):
+        return self.saving_type
+
+
+class DataVersion(models.Model):
+    """A counter bumped by every import and data edit; anything derived from transactions keys on it."""
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+    @classmethod
+    async def acurrent(cls):
+        return await cls.objects.filter(pk=1).values_list('version', flat=True).afirst() or 0
+
+    @classmethod
+    def bump(cls):
+        cls.objects.get_or_create(pk=1)
+        cls.objects.filter(pk=1).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+class ImportJob(models.Model):
+    """A queued sheet import, run by the ``run_import_worker`` command."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    sheet_id = models.CharField(max_length=100, null=True, blank=True)
+    sheet_name = models.CharField(max_length=100, null=True, blank=True)
+    incremental = models.BooleanField(default=False)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, blank=True, null=True, on_delete=models.SET_NULL)
+    phase = models.CharField(max_length=20, default='queued')
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_total = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the worker every IMPORT_JOB_HEARTBEAT seconds while the job runs.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # The single-flight lock: the database refuses a second running import.
+            models.UniqueConstraint(
+                fields=['status'], condition=models.Q(status='running'), name='single_running_import',
+            ),
+        ]
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    @property
+    def is_active(self):
+        return self.status in (self.QUEUED, self.RUNNING)
+
+    def __str__(self):
+        return f"Import #{self.pk} ({self.status})"
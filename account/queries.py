@@ -0,0 +1,28 @@
+# account/queries.py
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def top_n_per_group(queryset, partition_by, order_by, n):
+    """Keep the first ``n`` rows of every ``partition_by`` group, in one query.
+
+    ``order_by`` takes field names like ``QuerySet.order_by`` (``-`` for
+    descending) and ranks rows within each group with ``ROW_NUMBER()``.
+    The result is ordered by group, then rank, and each row carries its
+    ``row_number``. Works on any backend with window functions (SQLite
+    3.25+, PostgreSQL).
+    """
+    ranking = [
+        F(field[1:]).desc() if field.startswith('-') else F(field).asc()
+        for field in order_by
+    ]
+    return (
+        queryset
+        .annotate(row_number=Window(
+            RowNumber(),
+            partition_by=[F(field) for field in partition_by],
+            order_by=ranking,
+        ))
+        .filter(row_number__lte=n)
+        .order_by(*partition_by, 'row_number')
+    )
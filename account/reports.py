@@ -0,0 +1,101 @@
+# account/reports.py
+"""Shaping of report query rows into chart and table data."""
+from collections import defaultdict
+from decimal import Decimal
+import pandas as pd
+from trackalytics.timing import timed
+
+ANALYSIS_COLUMNS = ['account__name', 'category', 'month', 'total_out']
+
+
+def paise_to_rupees(paise):
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def period_label(period, group_by):
+    if group_by == "week":
+        return period.strftime("%d %b %Y")
+    if group_by == "quarter":
+        return f"Q{(period.month - 1) // 3 + 1} {period.year}"
+    if group_by == "year":
+        return period.strftime("%Y")
+    return period.strftime("%b %Y")
+
+
+@timed("compute")
+def trend_datasets(rows, group_by, top=10):
+    """Chart.js line series of the ``top`` categories by spend.
+
+    ``rows`` are ``period_totals`` rows with ``period``, ``category`` and
+    ``total_out``. They are read once into a dense category x period matrix,
+    so the cost grows with rows + cells, not their product.
+    """
+    category_totals = defaultdict(int)
+    for row in rows:
+        if row['total_out'] > 0:
+            category_totals[row['category']] += row['total_out']
+    top_categories = sorted(category_totals, key=category_totals.get, reverse=True)[:top]
+
+    matrix = {category: {} for category in top_categories}
+    for row in rows:
+        series = matrix.get(row['category'])
+        if series is not None and row['total_out'] > 0:
+            series[row['period']] = series.get(row['period'], 0) + row['total_out']
+
+    periods = sorted({period for series in matrix.values() for period in series})
+    datasets = [
+        {
+            "label": category,
+            "data": [float(matrix[category].get(period, 0)) for period in periods],
+            "fill": False,
+        }
+        for category in top_categories
+    ]
+    return [period_label(period, group_by) for period in periods], datasets
+
+
+@timed("compute")
+def category_analysis(rows, start_date, end_date, savings=("[Saving]",)):
+    """Current-month against average monthly spend per account and category.
+
+    ``rows`` are ``monthly_totals(..., paise=True)`` rows with ``account__name``,
+    ``category``, ``month`` and ``total_out``, so the sums below run on int64
+    paise and only the results are scaled to rupees. The average is over every month from
+    ``start_date`` to ``end_date``, the last of which is the current month.
+    Returns ``(analysis, totals, overall)``: per-account frames of the
+    categories spent on this month, the with/without ``savings`` sums, and
+    the average per category across accounts, largest first.
+    """
+    months = pd.period_range(start=start_date, end=end_date, freq='M')
+    df = pd.DataFrame(rows, columns=ANALYSIS_COLUMNS).astype({'total_out': 'int64'})
+    df = df[df['total_out'] > 0].assign(month=lambda frame: pd.to_datetime(frame['month']).dt.to_period('M'))
+
+    spend = df.pivot_table(
+        index=['account__name', 'category'], columns='month', values='total_out', aggfunc='sum', fill_value=0,
+    )
+    # Averages are rounded to whole paise, so every total below is an exact integer sum.
+    paise = pd.DataFrame({
+        'Current_Month': spend[months[-1]] if months[-1] in spend.columns else 0,
+        'Average': (spend.sum(axis=1) / len(months)).round().astype('int64'),
+    }, index=spend.index).reset_index().rename(columns={'category': 'Category'})
+    saving = paise['Category'].isin(savings)
+    totals = {
+        "total_average": paise_to_rupees(paise['Average'].sum()),
+        "current_month_average": paise_to_rupees(paise['Current_Month'].sum()),
+        "total_average_without_saving": paise_to_rupees(paise.loc[~saving, 'Average'].sum()),
+        "current_month_average_without_saving": paise_to_rupees(paise.loc[~saving, 'Current_Month'].sum()),
+    }
+
+    table = paise.assign(Current_Month=paise['Current_Month'] / 100, Average=paise['Average'] / 100)
+
+    columns = ['Category', 'Current_Month', 'Average']
+    analysis = {
+        account: frame[columns]
+        for account, frame in table[table['Current_Month'] > 0].groupby('account__name')
+    }
+
+    overall = (
+        table.groupby('Category', as_index=False)['Average'].sum()
+        .sort_values(by='Average', ascending=False)
+    )
+    return analysis, totals, overall
@@ -0,0 +1,212 @@
+# account/rollups.py
+"""The ``MonthlyCategoryTotal`` rollup and the report queries that read from it."""
+from collections import defaultdict
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from .fields import MoneyField
+from .models import MonthlyCategoryTotal, Transaction
+
+TOTALS = ('total_in', 'total_out', 'txn_count')
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def period_start(day, group_by):
+    """First day of the week, month, quarter or year containing ``day``."""
+    if group_by == "week":
+        return day - timedelta(days=day.weekday())
+    if group_by == "quarter":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    if group_by == "year":
+        return day.replace(month=1, day=1)
+    return month_start(day)
+
+
+def _totals(model, paise=False):
+    # Exact integer sums in SQL, returned as Decimal rupees or as raw int paise.
+    output_field = BigIntegerField() if paise else MoneyField()
+    return {
+        'total_in': Coalesce(Sum('money_in'), Value(0), output_field=output_field),
+        'total_out': Coalesce(Sum('money_out'), Value(0), output_field=output_field),
+        'txn_count': Count('id') if model is Transaction else Sum('txn_count'),
+    }
+
+
+def refresh_monthly_totals(months=None):
+    """Rebuild the rollup rows for ``months`` (any dates within them), or every month if None."""
+    rollups = MonthlyCategoryTotal.objects.all()
+    txns = Transaction.objects.filter(date__isnull=False).annotate(month=TruncMonth('date'))
+    if months is not None:
+        months = sorted({month_start(month) for month in months})
+        if not months:
+            return 0
+        rollups = rollups.filter(month__in=months)
+        txns = txns.filter(
+            date__gte=months[0], date__lt=months[-1] + relativedelta(months=1), month__in=months
+        )
+
+    grouped = txns.values('account', 'category', 'month').annotate(**_totals(Transaction)).order_by()
+
+    with transaction.atomic():
+        rollups.delete()
+        created = MonthlyCategoryTotal.objects.bulk_create([
+            MonthlyCategoryTotal(
+                account_id=row['account'],
+                category=row['category'],
+                month=row['month'],
+                money_in=row['total_in'],
+                money_out=row['total_out'],
+                txn_count=row['txn_count'],
+            )
+            for row in grouped
+        ], batch_size=2000)
+    return len(created)
+
+
+def split_range(start_date, end_date):
+    """Split ``[start_date, end_date]`` into whole months and partial-month edges.
+
+    Returns ``(months, edges)``: ``months`` is a ``(first, last)`` pair of
+    month starts (or None) and ``edges`` a list of ``(start, end)`` date
+    ranges that only cover part of a month.
+    """
+    first = start_date if start_date.day == 1 else month_start(start_date) + relativedelta(months=1)
+    after_end = end_date + timedelta(days=1)
+    stop = after_end if after_end.day == 1 else month_start(end_date)
+    if first >= stop:
+        return None, [(start_date, end_date)]
+
+    edges = []
+    if start_date < first:
+        edges.append((start_date, first - timedelta(days=1)))
+    if stop <= end_date:
+        edges.append((stop, end_date))
+    return (first, stop - relativedelta(months=1)), edges
+
+
+def monthly_totals_querysets(start_date, end_date, fields, exclude=None, paise=False, **filters):
+    """Grouped querysets that together cover ``[start_date, end_date]``.
+
+    Each yields dicts of ``fields`` plus ``total_in``, ``total_out`` (Decimal
+    rupees, or int paise with ``paise=True``) and ``txn_count``. ``fields`` may name ``month`` and any lookup valid on both
+    ``Transaction`` and ``MonthlyCategoryTotal`` (``category``,
+    ``account__name``...), as may ``filters`` and the ``exclude`` dict.
+    """
+    months, edges = split_range(start_date, end_date)
+    sources = []
+    if months:
+        sources.append(MonthlyCategoryTotal.objects.filter(month__range=months))
+    for edge in edges:
+        sources.append(Transaction.objects.filter(date__range=edge).annotate(month=TruncMonth('date')))
+
+    querysets = []
+    for source in sources:
+        source = source.filter(**filters)
+        if exclude:
+            source = source.exclude(**exclude)
+        querysets.append(source.values(*fields).annotate(**_totals(source.model, paise)).order_by())
+    return querysets
+
+
+def merge_totals(rows, fields):
+    """Sum rows from several ``monthly_totals_querysets`` sources that share a group."""
+    merged = defaultdict(lambda: dict.fromkeys(TOTALS, 0))
+    for row in rows:
+        totals = merged[tuple(row[field] for field in fields)]
+        for key in TOTALS:
+            totals[key] += row[key]
+    return [dict(zip(fields, group), **totals) for group, totals in merged.items()]
+
+
+def sort_rows(rows, order_by):
+    """Sort dicts like ``QuerySet.order_by``: field names, ``-`` prefix for descending."""
+    for spec in reversed(order_by):
+        field = spec.lstrip('-')
+        rows.sort(key=lambda row: (row[field] is not None, row[field]), reverse=spec.startswith('-'))
+    return rows
+
+
+def monthly_totals(start_date, end_date, fields, exclude=None, order_by=None, paise=False, **filters):
+    """Totals over ``[start_date, end_date]`` as a list of dicts, see ``monthly_totals_querysets``.
+
+    When a single source covers the range (whole months only, or a range
+    within one month) this is one grouped query sorted in SQL; otherwise the
+    sources are merged and sorted here. With ``REPORT_ENGINE = "columnar"``
+    the totals come from ``account.columnar`` instead, where it can answer.
+    """
+    if settings.REPORT_ENGINE == "columnar":
+        from .columnar import UnsupportedQuery, monthly_totals as columnar_totals
+        try:
+            return columnar_totals(start_date, end_date, fields, exclude, order_by, paise, **filters)
+        except UnsupportedQuery:
+            pass
+    querysets = monthly_totals_querysets(start_date, end_date, fields, exclude=exclude, paise=paise, **filters)
+    if len(querysets) == 1:
+        queryset = querysets[0]
+        return list(queryset.order_by(*order_by) if order_by else queryset)
+    rows = merge_totals((row for queryset in querysets for row in queryset), fields)
+    return sort_rows(rows, order_by) if order_by else rows
+
+
+def weekly_totals_queryset(start_date, end_date, fields=(), exclude=None, **filters):
+    """Totals per week (``period``, the Monday) and ``fields``, grouped from ``Transaction``."""
+    transactions = Transaction.objects.filter(date__range=[start_date, end_date], **filters)
+    if exclude:
+        transactions = transactions.exclude(**exclude)
+    return (
+        transactions.annotate(period=TruncWeek('date'))
+        .values('period', *fields).annotate(**_totals(Transaction)).order_by()
+    )
+
+
+def period_totals(start_date, end_date, group_by, fields=(), exclude=None, **filters):
+    """Totals per ``group_by`` period (week, month, quarter or year) and ``fields``.
+
+    Rows carry the period's first day as ``period``. Month and coarser
+    periods are folded from ``monthly_totals``; weeks cut across months and
+    are grouped from ``Transaction`` directly.
+    """
+    fields = tuple(fields)
+    if group_by == "week":
+        return list(weekly_totals_queryset(start_date, end_date, fields, exclude=exclude, **filters))
+
+    rows = monthly_totals(start_date, end_date, ('month',) + fields, exclude=exclude, **filters)
+    return fold_periods(rows, group_by, fields)
+
+
+def fold_periods(rows, group_by, fields=()):
+    """Merge ``monthly_totals`` rows into ``group_by`` periods."""
+    for row in rows:
+        row['period'] = period_start(row.pop('month'), group_by)
+    return merge_totals(rows, ('period',) + fields)
+
+
+async def amonthly_totals(start_date, end_date, fields, exclude=None, order_by=None, paise=False, **filters):
+    """``monthly_totals`` for async views, on the async ORM."""
+    if settings.REPORT_ENGINE == "columnar":
+        return await sync_to_async(monthly_totals)(
+            start_date, end_date, fields, exclude, order_by, paise, **filters,
+        )
+    querysets = monthly_totals_querysets(start_date, end_date, fields, exclude=exclude, paise=paise, **filters)
+    if len(querysets) == 1:
+        queryset = querysets[0]
+        return [row async for row in (queryset.order_by(*order_by) if order_by else queryset)]
+    rows = merge_totals([row for queryset in querysets async for row in queryset], fields)
+    return sort_rows(rows, order_by) if order_by else rows
+
+
+async def aperiod_totals(start_date, end_date, group_by, fields=(), exclude=None, **filters):
+    """``period_totals`` for async views, on the async ORM."""
+    fields = tuple(fields)
+    if group_by == "week":
+        return [row async for row in weekly_totals_queryset(start_date, end_date, fields, exclude=exclude, **filters)]
+
+    rows = await amonthly_totals(start_date, end_date, ('month',) + fields, exclude=exclude, **filters)
+    return fold_periods(rows, group_by, fields)
@@ -0,0 +1,206 @@
+# account/savings.py
+"""Savings tabs of the Google Sheet.
+
+``manage.py refresh_savings`` fetches the tabs concurrently and stores
+each as a ``SavingsSnapshot``, which ``saving_view`` renders without
+touching the sheet.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from trackalytics.timing import propagate, timed
+from .models import SavingsSnapshot
+from .utils import fetch_google_sheet
+
+
+def fetch_savings_in_father_account(sheet_id):
+    sheet_name = os.environ.get("SAVINGS_IN_FATHER_ACCOUNT_SHEET_NAME")
+    df = fetch_google_sheet(sheet_id, sheet_name)
+    df["Account Number"] = df["Account Number"].apply(lambda x: str(int(x)) if pd.notnull(x) else "")
+    df = df.rename(columns={"Savings In Father Account Account": "Account"})
+    df = df.fillna("")
+    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    exclude_columns = ["Document"]
+    df_filtered = df_clean.drop(columns=exclude_columns)
+    return df_filtered
+
+def fetch_savings_in_personl_account(sheet_id):
+    sheet_name = os.environ.get("SAVINGS_IN_PERSONAL_ACCOUNT_SHEET_NAME")
+    df = fetch_google_sheet(sheet_id, sheet_name)
+    df["Account Number"] = df["Account Number"].apply(lambda x: str(int(x)) if pd.notnull(x) else "")
+    df = df.rename(columns={"Savings Account Account": "Account"})
+    df = df.fillna("")
+    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    exclude_columns = ["Document"]
+    df_filtered = df_clean.drop(columns=exclude_columns)
+    return df_filtered
+
+def fetch_savings_in_gold(sheet_id):
+    sheet_name = os.environ.get("SAVINGS_IN_GOLD")
+    df = fetch_google_sheet(sheet_id, sheet_name)
+    df = df.rename(columns={"Gold Saving Date": "Date"})
+    df = df.fillna("")
+    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    return df_clean
+
+def fetch_mutual_funds(sheet_id):
+    sheet_name = os.environ.get("SAVINGS_IN_MUTUAL_FUNDS")
+    df = fetch_google_sheet(sheet_id, sheet_name)
+    df = df.rename(columns={"Mutual Funds Profile Fund Name": "Fund Name"})
+    df = df.fillna("")
+    return df
+
+def fetch_lic(sheet_id):
+    sheet_name = os.environ.get("SAVINGS_IN_LIC")
+    df = fetch_google_sheet(sheet_id, sheet_name)
+    df = df.rename(columns={"LIC Account": "Account"})
+    df = df.fillna("")
+    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    columns_to_keep = ['Premium Year', 'Premium Date', 'Balance', 'Paid']
+    df_filtered = df_clean[columns_to_keep]
+    df_filtered = df_filtered[df_filtered['Paid'] == 'Yes']
+    df_filtered["Premium Year"] = df_filtered["Premium Year"].astype(int)
+    exclude_columns = ["Paid"]
+    df_filtered = df_filtered.drop(columns=exclude_columns)
+    return df_filtered
+
+
+def _amounts(values):
+    """Numbers in ``values``, with thousands separators; blanks and text are dropped."""
+    text = pd.Series(values, dtype=object).astype(str).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(text, errors='coerce').dropna().astype("float64").tolist()
+
+
+def _value(df, label_column, label, value_column):
+    return _amounts(df.loc[df[label_column] == label, value_column])[0]
+
+
+def _account_totals(df_filtered):
+    total_row = df_filtered[df_filtered['Account'] == 'Total'].iloc[0]
+    return _amounts(total_row)[:2]
+
+
+def father_account_tab(sheet_id):
+    df_filtered = fetch_savings_in_father_account(sheet_id)
+    minimum_total, maximum_total = _account_totals(df_filtered)
+    return df_filtered, minimum_total, maximum_total
+
+
+def personal_account_tab(sheet_id):
+    df_filtered = fetch_savings_in_personl_account(sheet_id)
+    minimum_total, maximum_total = _account_totals(df_filtered)
+    return df_filtered, minimum_total, maximum_total
+
+
+def gold_tab(sheet_id):
+    df_clean = fetch_savings_in_gold(sheet_id)
+    columns_to_keep = ['Date', 'Gold Type', 'Gross Weight', 'Gold Rate per gm', 'Purchased Amount']
+    df_filtered = df_clean[columns_to_keep]
+    df_filtered = df_filtered.dropna(how='all')
+    df_filtered = df_filtered[df_filtered['Date'].notna() & (df_filtered['Date'] != '')]
+    selling_amount = _value(df_clean, 'Overview', 'Selling Amount', 'Value')
+    current_value = _value(df_clean, 'Overview', 'Current Value', 'Value')
+    return df_filtered, selling_amount, current_value
+
+
+def mutual_funds_tab(sheet_id):
+    df = fetch_mutual_funds(sheet_id)
+    df_selected = df.iloc[0:8, 8:16]
+    mf_purchased_value, mf_current_value = _amounts(df.iloc[1, 21:23])
+    return df_selected, mf_current_value, mf_purchased_value
+
+
+def lic_tab(sheet_id):
+    df_filtered = fetch_lic(sheet_id)
+    return df_filtered, 0.0, 0.0
+
+
+# (saving type, sheet name setting, loader) in display order; each loader returns
+# (frame, minimum, maximum).
+SAVINGS_TABS = [
+    ("Savings In Parents Account", "SAVINGS_IN_FATHER_ACCOUNT_SHEET_NAME", father_account_tab),
+    ("Savings In Personal Account", "SAVINGS_IN_PERSONAL_ACCOUNT_SHEET_NAME", personal_account_tab),
+    ("Savings In Gold", "SAVINGS_IN_GOLD", gold_tab),
+    ("Savings In Mutual Funds", "SAVINGS_IN_MUTUAL_FUNDS", mutual_funds_tab),
+    ("Savings In LIC", "SAVINGS_IN_LIC", lic_tab),
+]
+
+
+def _timed(loader, sheet_id, sheet_name=None):
+    started = time.perf_counter()
+    try:
+        if sheet_name:
+            # Revalidate the cached tab so the loader sees the current sheet.
+            fetch_google_sheet(sheet_id, sheet_name, max_age=0)
+        # Shaping the tab with pandas; its sheet download is timed separately.
+        with timed("compute"):
+            df, minimum, maximum = loader(sheet_id)
+            value = [str(column) for column in df.columns], df.astype(str).values.tolist(), minimum, maximum
+        return value, None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+def _tab_results(outcomes, timeout, started):
+    """One result dict per tab from its ``_timed`` outcome, or None if it didn't finish in time."""
+    results = []
+    for (saving_type, _, _), outcome in zip(SAVINGS_TABS, outcomes):
+        tab = {"saving_type": saving_type, "columns": [], "rows": [], "minimum": 0.0, "maximum": 0.0}
+        if outcome is not None:
+            value, error, seconds = outcome
+        else:
+            value, seconds = None, time.perf_counter() - started
+            error = TimeoutError(f"Timed out after {timeout}s")
+        if value is not None:
+            tab["columns"], tab["rows"], tab["minimum"], tab["maximum"] = value
+        tab.update({"seconds": seconds, "error": str(error) if error else None})
+        results.append(tab)
+    return results
+
+
+def load_savings(sheet_id, timeout=None, revalidate=False):
+    """Load every savings tab in parallel.
+
+    Returns one dict per tab in ``SAVINGS_TABS`` order with ``saving_type``,
+    ``columns``, ``rows`` (cells as strings), ``minimum``, ``maximum``,
+    ``seconds`` and ``error``. A tab that fails or takes longer than
+    ``timeout`` seconds only sets its own ``error``; the others are still
+    returned. ``revalidate=True`` bypasses the sheet cache's TTL.
+    """
+    timeout = settings.SAVINGS_TAB_TIMEOUT if timeout is None else timeout
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=len(SAVINGS_TABS), thread_name_prefix="savings")
+    futures = [
+        executor.submit(propagate(_timed), loader, sheet_id, os.environ.get(setting) if revalidate else None)
+        for _, setting, loader in SAVINGS_TABS
+    ]
+    wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+    return _tab_results([future.result() if future.done() else None for future in futures], timeout, started)
+
+
+def refresh_savings(sheet_id, timeout=None):
+    """Fetch every savings tab and store it as a ``SavingsSnapshot``; returns the ``load_savings`` results.
+
+    A tab that fails keeps its last good rows, totals and ``refreshed_at``
+    and only records the error.
+    """
+    tabs = load_savings(sheet_id, timeout, revalidate=True)
+    refreshed_at = timezone.now()
+    with transaction.atomic():
+        for position, tab in enumerate(tabs):
+            fields = {"position": position, "error": tab["error"] or "", "seconds": tab["seconds"]}
+            if not tab["error"]:
+                fields.update({
+                    "columns": tab["columns"],
+                    "rows": tab["rows"],
+                    "minimum": tab["minimum"],
+                    "maximum": tab["maximum"],
+                    "refreshed_at": refreshed_at,
+                })
+            SavingsSnapshot.objects.update_or_create(saving_type=tab["saving_type"], defaults=fields)
+    return tabs
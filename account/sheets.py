@@ -0,0 +1,164 @@
+# account/sheets.py
+"""Google Sheet fetching with a pooled session and a parsed-DataFrame cache.
+
+``get_sheet_cache()`` is built from the ``SHEET_*`` settings. Pointing
+``SHEET_SOURCE_DIR`` at a directory of ``<sheet name>.csv`` files swaps the
+remote for a local stand-in, which is what the tests do.
+"""
+import threading
+import time
+from collections import OrderedDict
+from io import StringIO
+from pathlib import Path
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from trackalytics.timing import timed
+
+GOOGLE_SHEET_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq"
+
+
+class GoogleSheetSource:
+    """Downloads a sheet tab as CSV, revalidating with ETag / Last-Modified when available."""
+
+    def __init__(self, timeout=10, pool_size=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+
+    def fetch(self, sheet_id, sheet_name, validators=None):
+        """Return ``(text, validators)``; ``text`` is None when the sheet is unchanged."""
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = self.session.get(
+            GOOGLE_SHEET_URL.format(sheet_id=sheet_id),
+            params={"tqx": "out:csv", "sheet": sheet_name},
+            headers=headers,
+            timeout=self.timeout,
+        )
+        if response.status_code == 304:
+            return None, validators
+        if response.status_code != 200:
+            raise ValueError("❌ Failed to fetch the Google Sheet.")
+        return response.text, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+
+class LocalSheetSource:
+    """Reads ``<directory>/<sheet_name>.csv``, using the file mtime as its validator."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def fetch(self, sheet_id, sheet_name, validators=None):
+        path = self.directory / f"{sheet_name}.csv"
+        if not path.exists():
+            raise ValueError("❌ Failed to fetch the Google Sheet.")
+        modified = str(path.stat().st_mtime_ns)
+        if validators and validators.get("last_modified") == modified:
+            return None, validators
+        return path.read_text(encoding="utf-8"), {"etag": None, "last_modified": modified}
+
+
+class SheetCache:
+    """A TTL + LRU cache of parsed sheets keyed by ``(sheet_id, sheet_name, header)``.
+
+    Expired entries are revalidated against the source rather than dropped,
+    so an unchanged sheet is not downloaded or parsed again.
+    """
+
+    def __init__(self, source, ttl=300, max_entries=32):
+        self.source = source
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def get(self, sheet_id, sheet_name, header=0, max_age=None):
+        """Return a copy of the parsed sheet, fetching it if older than ``max_age`` seconds."""
+        key = (sheet_id, sheet_name, header)
+        max_age = self.ttl if max_age is None else max_age
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry["fetched_at"] < max_age:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["df"].copy()
+
+        with timed("sheet"):
+            text, validators = self.source.fetch(sheet_id, sheet_name, entry["validators"] if entry else None)
+
+        if text is None:
+            df = entry["df"]
+        else:
+            # Parsed outside the lock, so tabs fetched concurrently also parse concurrently.
+            with timed("compute"):
+                df = pd.read_csv(StringIO(text), header=header)
+
+        with self._lock:
+            if text is None:
+                self.revalidated += 1
+            else:
+                self.misses += 1
+            self._entries[key] = {"df": df, "validators": validators, "fetched_at": time.monotonic()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return df.copy()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+_sheet_cache = None
+_sheet_cache_lock = threading.Lock()
+
+
+def get_sheet_cache():
+    global _sheet_cache
+    with _sheet_cache_lock:
+        if _sheet_cache is None:
+            if settings.SHEET_SOURCE_DIR:
+                source = LocalSheetSource(settings.SHEET_SOURCE_DIR)
+            else:
+                source = GoogleSheetSource(timeout=settings.SHEET_FETCH_TIMEOUT)
+            _sheet_cache = SheetCache(
+                source,
+                ttl=settings.SHEET_CACHE["TTL"],
+                max_entries=settings.SHEET_CACHE["MAX_ENTRIES"],
+            )
+        return _sheet_cache
+
+
+@receiver(setting_changed)
+def reset_sheet_cache(setting, **kwargs):
+    global _sheet_cache
+    if setting.startswith("SHEET_"):
+        with _sheet_cache_lock:
+            _sheet_cache = None
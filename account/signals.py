@@ -0,0 +1,65 @@
+# account/signals.py
+"""Keep the derived data current when transactions or banks change outside an import.
+
+The importer rebuilds ``MonthlyCategoryTotal`` and ``DailyBalance`` and
+bumps ``DataVersion`` itself, writing with bulk operations that send no
+signals. These receivers cover every other ``save()`` and ``delete()``:
+the admin, the shell, data fixes. Balances are rebuilt in full, which is
+fine for one-off edits but not for bulk changes; use an import for those.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .balances import rebuild_balances
+from .columnar import refresh_store
+from .models import Bank, DataVersion, Transaction
+from .rollups import refresh_monthly_totals
+
+
+def data_changed():
+    """Make everything keyed on ``DataVersion`` stale, as an import does."""
+    DataVersion.bump()
+    if settings.REPORT_ENGINE == "columnar":
+        transaction.on_commit(refresh_store)
+
+
+def transactions_changed(days=None):
+    """Refresh the rollups of the months containing ``days`` (all if None) and every balance."""
+    refresh_monthly_totals(None if days is None else [day for day in days if day is not None])
+    rebuild_balances()
+    data_changed()
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_stored_date(sender, instance, raw=False, **kwargs):
+    # A changed date moves the row out of its old month as well as into the new one.
+    if not raw:
+        instance._stored_date = (
+            Transaction.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+            if instance.pk else None
+        )
+
+
+@receiver(post_save, sender=Transaction)
+def transaction_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transactions_changed([instance.date, getattr(instance, '_stored_date', None)])
+
+
+@receiver(post_delete, sender=Transaction)
+def transaction_deleted(sender, instance, **kwargs):
+    transactions_changed([instance.date])
+
+
+@receiver(post_save, sender=Bank)
+def bank_saved(sender, instance, raw=False, **kwargs):
+    # Reports and forecasts filter on is_active and group by name; neither is in the rollups.
+    if not raw:
+        data_changed()
+
+
+@receiver(post_delete, sender=Bank)
+def bank_deleted(sender, instance, **kwargs):
+    # Its transactions were set to no account and its rollups and balances cascaded away.
+    transactions_changed()
@@ -0,0 +1,69 @@
+# account/snapshots.py
+"""Parquet snapshots of the cleaned register, written after every sheet import.
+
+A snapshot is the ``preprocess_transaction_data`` frame as it was loaded:
+typed columns (timestamp ``Date``, string text, float64 amounts), zstd
+compressed, with the import's ``DataVersion`` in the file metadata. They
+sit in ``SNAPSHOT_DIR`` as ``transactions-<UTC time>.parquet``, the newest
+``SNAPSHOT_KEEP`` kept, and can be restored with
+``manage.py load_transactions --from-snapshot`` or read directly with
+pandas for offline analysis.
+"""
+import os
+from pathlib import Path
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+from .utils import MONEY_COLUMNS, TEXT_COLUMNS
+
+SNAPSHOT_COLUMNS = ['Date'] + TEXT_COLUMNS + MONEY_COLUMNS
+PATTERN = "transactions-*.parquet"
+
+
+def write_snapshot(df, data_version, directory=None):
+    """Write the cleaned frame ``df`` as a new snapshot; returns its path."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    directory = Path(directory or settings.SNAPSHOT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    created = timezone.now()
+    path = directory / f"transactions-{created:%Y%m%dT%H%M%S%fZ}.parquet"
+
+    df = df.reindex(columns=SNAPSHOT_COLUMNS).astype({column: "string" for column in TEXT_COLUMNS})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"trackalytics.data_version": str(data_version).encode(),
+        b"trackalytics.created_at": created.isoformat().encode(),
+    })
+    # Write-then-rename so a restore never reads a half-written file.
+    tmp = path.with_suffix(".tmp")
+    try:
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    for old in list_snapshots(directory)[settings.SNAPSHOT_KEEP:]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def list_snapshots(directory=None):
+    """Snapshot files in ``directory``, newest first."""
+    return sorted(Path(directory or settings.SNAPSHOT_DIR).glob(PATTERN), reverse=True)
+
+
+def read_snapshot(path):
+    """Return the cleaned frame stored at ``path``, or in the newest snapshot if ``path`` is a directory."""
+    path = Path(path)
+    if path.is_dir():
+        snapshots = list_snapshots(path)
+        if not snapshots:
+            raise ValueError(f"❌ No snapshots in {path}.")
+        path = snapshots[0]
+    if not path.exists():
+        raise ValueError(f"❌ Snapshot {path} does not exist.")
+    # The pandas metadata in the file restores the string and datetime dtypes.
+    return pd.read_parquet(path, engine="pyarrow")
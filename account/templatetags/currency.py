@@ -0,0 +1,22 @@
+from decimal import Decimal
+from django import template
+from account.formatting import format_inr, format_inr_array
+
+register = template.Library()
+
+@register.filter
+def inr(value, decimals=2):
+    """{{ amount|inr }} -> ₹1,23,456.00; non-numeric values are shown as they are."""
+    if value is None or value == "":
+        return ""
+    if not isinstance(value, (int, float, Decimal)):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return value
+    return format_inr(value, int(decimals))
+
+@register.filter
+def inr_each(values, decimals=2):
+    """{% for amount in amounts|inr_each %}: a whole list, array or Series formatted in one call."""
+    return list(format_inr_array(values, int(decimals)))
@@ -1,3 +1,1004 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.template import Context, Template
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from unittest import skipUnless
+from unittest.mock import patch
+from io import StringIO
+from django.urls import reverse
+import os
+import threading
+import json
+import time
+import tempfile
+from pathlib import Path
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.contrib.auth.models import User
+import numpy as np
+import pandas as pd
+from decimal import Decimal
+from datetime import date, timedelta
+from .balances import balance_series
+from .models import Bank, Category, DailyBalance, DataVersion, ImportJob, MonthlyCategoryTotal, Transaction
+from .cache import get_report_cache, report_cache_stats
+from .columnar import get_store
+from .importer import import_from_sheet, import_transactions
+from .snapshots import list_snapshots, read_snapshot
+from .forecast import train_forecasts
+from .formatting import format_inr, format_inr_array
+from .loadtest import REPORT_URLS, default_paths
+from .jobs import JobReporter, claim_next_job, enqueue_import, job_progress, run_job, run_pending_jobs
+from .rollups import monthly_totals, period_totals, split_range
+from .reports import trend_datasets
+from .queries import top_n_per_group
+from .sheets import get_sheet_cache
+from .utils import fetch_google_sheet, preprocess_transaction_data
 
-# Create your tests here.
+
+def make_sheet(rows):
+    return pd.DataFrame(rows, columns=[
+        'Date', 'Income and Expense Account', 'Description', 'Category',
+        'Income Money IN', 'Expense Money OUT', 'Account Balance',
+    ])
+
+
+SHEET_ROWS = [
+    ['01/05/2025', 'HDFC Savings', 'Rent', '[Rent]', None, '15,000.00', '85,000.00'],
+    ['01/06/2025', 'HDFC Savings', 'Salary', '[Salary]', '1,00,000', None, '1,85,000.00'],
+    ['01/07/2025', 'SBI', 'Groceries', '[Food]', None, '2,500.50', '7,499.50'],
+    [None, 'Total', None, None, None, None, None],
+]
+
+
+class ImportTransactionsTest(TestCase):
+
+    def test_reload_replaces_rows_and_resolves_banks(self):
+        Bank.objects.create(name="HDFC Savings")
+        Transaction.objects.create(description="stale", money_out=1)
+
+        result = import_transactions(make_sheet(SHEET_ROWS))
+
+        self.assertEqual(result["rows"], 3)
+        self.assertEqual(Transaction.objects.count(), 3)
+        self.assertEqual(Bank.objects.count(), 2)
+        self.assertFalse(Transaction.objects.filter(description="stale").exists())
+        rent = Transaction.objects.get(description="Rent")
+        self.assertEqual(rent.account.name, "HDFC Savings")
+        self.assertEqual(rent.money_out, 15000.0)
+        self.assertEqual(rent.money_in, 0.0)
+
+    def test_incremental_sync_applies_only_the_delta(self):
+        import_transactions(make_sheet(SHEET_ROWS))
+        rent_id = Transaction.objects.get(description="Rent").id
+
+        rows = [list(row) for row in SHEET_ROWS]
+        rows[1][4] = '1,10,000'                        # salary corrected -> update
+        del rows[2]                                    # groceries removed -> delete
+        rows.insert(0, ['01/08/2025', 'SBI', 'Fuel', '[Travel]', None, '3,000', '4,499.50'])
+
+        result = import_transactions(make_sheet(rows), incremental=True)
+
+        self.assertEqual(
+            (result["inserted"], result["updated"], result["deleted"], result["unchanged"]),
+            (1, 1, 1, 1),
+        )
+        self.assertEqual(Transaction.objects.get(description="Rent").id, rent_id)
+        self.assertEqual(Transaction.objects.get(description="Salary").money_in, 110000.0)
+        self.assertFalse(Transaction.objects.filter(description="Groceries").exists())
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_malformed_cells_are_rejected_not_zeroed(self):
+        rows = [list(row) for row in SHEET_ROWS]
+        rows[0][5] = 'n/a'
+        rows[2][0] = '2025-01-07'
+
+        result = import_transactions(make_sheet(rows))
+
+        self.assertEqual(result["rows"], 1)
+        self.assertEqual(
+            [(r["column"], r["value"]) for r in result["rejected"]],
+            [('Expense Money OUT', 'n/a'), ('Date', '2025-01-07')],
+        )
+        self.assertEqual(list(Transaction.objects.values_list('description', flat=True)), ["Salary"])
+
+
+class SheetCacheTest(TestCase):
+
+    def setUp(self):
+        self.sheet_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.sheet_dir.cleanup)
+        settings_override = override_settings(
+            SHEET_SOURCE_DIR=self.sheet_dir.name,
+            SHEET_CACHE={"TTL": 300, "MAX_ENTRIES": 2},
+            SNAPSHOT_DIR=self.sheet_dir.name,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write_sheet(self, name, df):
+        df.to_csv(os.path.join(self.sheet_dir.name, f"{name}.csv"), index=False)
+
+    def test_cached_parse_revalidation_and_lru_eviction(self):
+        for name in ("A", "B", "C"):
+            self.write_sheet(name, pd.DataFrame({"x": [1, 2]}))
+
+        first = fetch_google_sheet("sheet", "A")
+        first["x"] = 0                                  # callers get their own copy
+        self.assertEqual(fetch_google_sheet("sheet", "A")["x"].tolist(), [1, 2])
+        fetch_google_sheet("sheet", "A", max_age=0)     # unchanged file -> revalidated
+        fetch_google_sheet("sheet", "B")
+        fetch_google_sheet("sheet", "C")                # evicts A
+        fetch_google_sheet("sheet", "A")
+
+        stats = get_sheet_cache().stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["revalidated"]), (1, 4, 1))
+        self.assertEqual(stats["entries"], 2)
+
+    def test_import_reads_through_the_local_stand_in(self):
+        self.write_sheet("Register", make_sheet(SHEET_ROWS))
+
+        result = import_from_sheet("sheet", "Register")
+
+        self.assertEqual(result["rows"], 3)
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_saving_view_renders_the_refreshed_snapshot_when_tabs_fail(self):
+        self.write_sheet(os.environ["SAVINGS_IN_LIC"], pd.DataFrame({
+            "LIC Account": ["Policy 1", "Policy 1"],
+            "Premium Year": [2024, 2025],
+            "Premium Date": ["03/01/2024", "03/01/2025"],
+            "Balance": ["10,000", "20,000"],
+            "Paid": ["Yes", "No"],
+        }))
+        self.write_sheet(os.environ["SAVINGS_IN_GOLD"], pd.DataFrame({
+            "Gold Saving Date": ["01/01/2024", None],
+            "Gold Type": ["Coin", None],
+            "Gross Weight": [8, None],
+            "Gold Rate per gm": ["6,000", None],
+            "Purchased Amount": ["48,000", None],
+            "Overview": ["Current Value", "Selling Amount"],
+            "Value": ["60,500.50", "58,000"],
+        }))
+
+        self.assertContains(self.client.get(reverse("saving")), "refresh_savings")
+        call_command("refresh_savings", stdout=StringIO(), stderr=StringIO())
+        self.write_sheet(os.environ["SAVINGS_IN_LIC"], pd.DataFrame({"Broken": [1]}))
+        call_command("refresh_savings", stdout=StringIO(), stderr=StringIO())
+
+        with self.assertNumQueries(1), patch.object(get_sheet_cache().source, "fetch") as fetch:
+            response = self.client.get(reverse("saving"))
+        fetch.assert_not_called()
+
+        self.assertEqual(response.status_code, 200)
+        tabs = {tab.saving_type: tab for tab in response.context["object_list"]}
+        gold, lic = tabs["Savings In Gold"], tabs["Savings In LIC"]
+        self.assertEqual((gold.minimum, gold.maximum), (Decimal("58000.00"), Decimal("60500.50")))
+        self.assertEqual(gold.rows, [["01/01/2024", "Coin", "8.0", "6,000", "48,000"]])
+        self.assertTrue(lic.error)                      # the second refresh failed...
+        self.assertEqual(lic.rows, [["2024", "03/01/2024", "10,000"]])   # ...so the first one is shown
+        self.assertIsNone(tabs["Savings In Parents Account"].refreshed_at)
+        self.assertEqual(response.context["maximum_total"], Decimal("60500.50"))
+        self.assertContains(response, "<td>Coin</td>")
+        self.assertContains(response, f"last fetch took {gold.seconds:.2f}s")
+
+
+class MonthlyRollupTest(TestCase):
+
+    def setUp(self):
+        rows = [
+            ['01/15/2025', 'SBI', 'Lunch', '[Food]', None, '100', '0'],
+            ['01/31/2025', 'SBI', 'Dinner', '[Food]', None, '200', '0'],
+            ['02/10/2025', 'SBI', 'Snacks', '[Food]', None, '300', '0'],
+            ['03/01/2025', 'SBI', 'Breakfast', '[Food]', None, '400', '0'],
+            ['03/20/2025', 'SBI', 'Cab', '[Travel]', None, '500', '0'],
+        ]
+        self.rows = rows
+        import_transactions(make_sheet(rows))
+
+    def test_split_range(self):
+        self.assertEqual(
+            split_range(date(2025, 1, 15), date(2025, 3, 10)),
+            ((date(2025, 2, 1), date(2025, 2, 1)),
+             [(date(2025, 1, 15), date(2025, 1, 31)), (date(2025, 3, 1), date(2025, 3, 10))]),
+        )
+        self.assertEqual(split_range(date(2025, 1, 1), date(2025, 3, 31)),
+                         ((date(2025, 1, 1), date(2025, 3, 1)), []))
+        self.assertEqual(split_range(date(2025, 1, 2), date(2025, 1, 30)),
+                         (None, [(date(2025, 1, 2), date(2025, 1, 30))]))
+
+    def test_partial_months_combine_rollup_and_raw_edges(self):
+        totals = monthly_totals(date(2025, 1, 20), date(2025, 3, 10), ('category',))
+        self.assertEqual(totals, [{'category': '[Food]', 'total_in': 0, 'total_out': 900.0, 'txn_count': 3}])
+
+    def test_trend_series_by_week_and_quarter(self):
+        weekly = period_totals(date(2025, 1, 1), date(2025, 3, 31), "week", ('category',))
+        self.assertEqual(trend_datasets(weekly, "week", top=1), (
+            ['13 Jan 2025', '27 Jan 2025', '10 Feb 2025', '24 Feb 2025'],
+            [{"label": "[Food]", "data": [100.0, 200.0, 300.0, 400.0], "fill": False}],
+        ))
+        quarterly = period_totals(date(2025, 1, 10), date(2025, 3, 31), "quarter", ('category',))
+        self.assertEqual(trend_datasets(quarterly, "quarter"), (
+            ['Q1 2025'],
+            [{"label": "[Food]", "data": [1000.0], "fill": False},
+             {"label": "[Travel]", "data": [500.0], "fill": False}],
+        ))
+
+    def test_incremental_sync_refreshes_only_touched_months(self):
+        self.assertEqual(MonthlyCategoryTotal.objects.count(), 4)
+        january = MonthlyCategoryTotal.objects.get(month=date(2025, 1, 1))
+        self.rows[4][5] = '550'
+
+        result = import_transactions(make_sheet(self.rows), incremental=True)
+
+        self.assertEqual(result["months"], [date(2025, 3, 1)])
+        self.assertEqual(MonthlyCategoryTotal.objects.get(month=date(2025, 1, 1)).id, january.id)
+        self.assertEqual(MonthlyCategoryTotal.objects.get(category='[Travel]').money_out, 550.0)
+
+
+class InrFormattingTest(SimpleTestCase):
+
+    def test_indian_grouping(self):
+        cases = {
+            0: "₹0.00",
+            999.995: "₹1,000.00",
+            100000: "₹1,00,000.00",
+            -1234567.5: "-₹12,34,567.50",
+            -0.001: "₹0.00",
+            Decimal("98765.43"): "₹98,765.43",
+            float("nan"): "",
+            None: "",
+        }
+        for amount, expected in cases.items():
+            with self.subTest(amount=amount):
+                self.assertEqual(format_inr(amount), expected)
+        self.assertEqual(format_inr(1234567.89, decimals=0), "₹12,34,568")
+
+    def test_array_matches_scalar(self):
+        amounts = np.random.default_rng(0).uniform(-1e9, 1e9, 2000).round(3)
+        amounts[:3] = [np.nan, np.inf, 5e-4]
+
+        formatted = format_inr_array(pd.Series(amounts, index=range(10, 2010)))
+
+        self.assertEqual(list(formatted.index), list(range(10, 2010)))
+        self.assertEqual(formatted.tolist(), [format_inr(amount) for amount in amounts])
+
+    def test_template_filters(self):
+        rendered = Template(
+            "{% load currency %}{{ amount|inr }} {{ amount|inr:0 }} {{ text|inr }}"
+            "{% for value in amounts|inr_each %} {{ value }}{% endfor %}"
+        ).render(Context({"amount": 250000.5, "text": "n/a", "amounts": [1, 1e7]}))
+
+        self.assertEqual(rendered, "₹2,50,000.50 ₹2,50,000 n/a ₹1.00 ₹1,00,00,000.00")
+
+
+class ImportJobTest(TestCase):
+
+    def setUp(self):
+        sheet_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(sheet_dir.cleanup)
+        make_sheet(SHEET_ROWS).to_csv(os.path.join(sheet_dir.name, "Register.csv"), index=False)
+        settings_override = override_settings(SHEET_SOURCE_DIR=sheet_dir.name, SNAPSHOT_DIR=sheet_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_post_queues_a_job_that_the_worker_runs(self):
+        with patch.dict(os.environ, {"TRANSACTION_SHEET_NAME": "Register"}):
+            response = self.client.post(reverse("home_view"), {"mode": "incremental"})
+            self.client.post(reverse("home_view"), {"mode": "incremental"})
+
+        job = ImportJob.objects.get()
+        self.assertEqual((job.status, job.incremental), (ImportJob.QUEUED, True))
+        self.assertContains(response, reverse("import_status", args=[job.pk]))
+        self.assertEqual(Transaction.objects.count(), 0)
+
+        out = StringIO()
+        call_command("run_import_worker", "--once", stdout=out)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual((job.rows_processed, job.result["inserted"]), (3, 3))
+        self.assertEqual(Transaction.objects.count(), 3)
+        response = self.client.get(reverse("import_status", args=[job.pk]))
+        self.assertContains(response, "Transactions are updated!")
+        self.assertNotContains(response, "hx-get")
+
+    def test_only_one_import_runs_at_a_time(self):
+        running = ImportJob.objects.create(status=ImportJob.RUNNING, started_at=timezone.now())
+        queued = enqueue_import("sheet", "Register")
+
+        self.assertIsNone(claim_next_job())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ImportJob.objects.filter(pk=queued.pk).update(status=ImportJob.RUNNING)
+
+        ImportJob.objects.filter(pk=running.pk).update(started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(claim_next_job(), queued)
+        running.refresh_from_db()
+        self.assertEqual(running.status, ImportJob.FAILED)
+
+    def test_running_job_with_a_recent_heartbeat_is_not_failed(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        running = ImportJob.objects.create(status=ImportJob.RUNNING, started_at=long_ago, heartbeat_at=timezone.now())
+        enqueue_import("sheet", "Register")
+
+        self.assertIsNone(claim_next_job())
+        running.refresh_from_db()
+        self.assertEqual(running.status, ImportJob.RUNNING)
+
+    def test_rejected_blank_dates_are_stored_as_json_null(self):
+        rows = SHEET_ROWS[:2] + [[None, 'SBI', 'Undated', '[Misc]', None, '10', '0']]
+        with open(os.path.join(settings.SHEET_SOURCE_DIR, "Register.csv"), "w") as sheet:
+            make_sheet(rows).to_csv(sheet, index=False)
+        enqueue_import("sheet", "Register")
+
+        job, = run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual(job.result["rejected"], [{"row": 2, "column": "Date", "value": None}])
+        self.assertNotIn("NaN", json.dumps(job.result, cls=DjangoJSONEncoder))
+
+    def test_failed_import_is_recorded(self):
+        enqueue_import("sheet", "Missing")
+
+        job, = run_pending_jobs()
+
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertIn("Failed to fetch", job.message)
+
+    def test_progress_is_reported_per_batch(self):
+        rows = [['01/05/2025', 'SBI', f'Txn {i}', '[Misc]', None, '1', '0'] for i in range(5)]
+        calls = []
+
+        import_transactions(make_sheet(rows), batch_size=2, progress=lambda *args: calls.append(args))
+
+        writes = [args[1:] for args in calls if args[0] == "writing"]
+        self.assertEqual(writes, [(0, 5), (2, 5), (4, 5), (5, 5)])
+        self.assertEqual([args[0] for args in calls if args[0] != "writing"], ["parsing", "rollups", "balances"])
+
+
+class JobReporterTest(TransactionTestCase):
+
+    def test_progress_and_heartbeat_are_written_to_the_job_row(self):
+        job = ImportJob.objects.create(status=ImportJob.RUNNING, started_at=timezone.now())
+
+        with JobReporter(job, interval=60) as report:
+            report("writing", 2000, 5000)
+            deadline = time.monotonic() + 5
+            while ImportJob.objects.get(pk=job.pk).phase != "writing" and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        job.refresh_from_db()
+        self.assertEqual(job_progress(job), {"phase": "writing", "processed": 2000, "total": 5000})
+        self.assertIsNotNone(job.heartbeat_at)
+
+
+    def test_a_running_import_reports_its_phase_before_it_finishes(self):
+        sheet_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(sheet_dir.cleanup)
+        make_sheet(SHEET_ROWS).to_csv(os.path.join(sheet_dir.name, "Register.csv"), index=False)
+        job = ImportJob.objects.create(
+            status=ImportJob.RUNNING, started_at=timezone.now(), sheet_id="sheet", sheet_name="Register",
+        )
+        parsing = threading.Event()
+        release = threading.Event()
+
+        def slow_preprocess(df):
+            parsing.set()
+            release.wait(10)
+            return preprocess_transaction_data(df)
+
+        def work():
+            try:
+                run_job(job)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=work)
+        with override_settings(SHEET_SOURCE_DIR=sheet_dir.name, SNAPSHOT_DIR=sheet_dir.name, IMPORT_JOB_HEARTBEAT=60), \
+                patch("account.importer.preprocess_transaction_data", slow_preprocess):
+            worker.start()
+            self.assertTrue(parsing.wait(10))
+            deadline = time.monotonic() + 5
+            while ImportJob.objects.get(pk=job.pk).phase != "parsing" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            seen = ImportJob.objects.get(pk=job.pk)
+            release.set()
+            worker.join(10)
+
+        self.assertEqual(seen.status, ImportJob.RUNNING)
+        self.assertEqual(job_progress(seen), {"phase": "parsing", "processed": 0, "total": 4})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_processed), (ImportJob.SUCCEEDED, 3))
+
+
+class SnapshotTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        make_sheet(SHEET_ROWS).to_csv(self.directory / "Register.csv", index=False)
+        settings_override = override_settings(
+            SHEET_SOURCE_DIR=directory.name, SNAPSHOT_DIR=self.directory / "snapshots", SNAPSHOT_KEEP=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_sheet_import_writes_a_typed_snapshot_that_restores_offline(self):
+        import pyarrow.parquet as pq
+
+        result = import_from_sheet("sheet", "Register")
+
+        snapshot = Path(result["snapshot"])
+        self.assertEqual(list_snapshots(), [snapshot])
+        self.assertEqual(pq.read_schema(snapshot).metadata[b"trackalytics.data_version"], b"1")
+        df = read_snapshot(snapshot)
+        self.assertEqual(str(df["Date"].dtype), "datetime64[ns]")
+        self.assertEqual(df["Expense Money OUT"].tolist(), [15000.0, 0.0, 2500.5])
+
+        expected = list(Transaction.objects.order_by('sync_key').values_list(
+            'sync_key', 'account__name', 'date', 'money_in', 'money_out', 'account_balance'))
+        Transaction.objects.all().delete()
+        os.remove(self.directory / "Register.csv")       # no sheet: the restore must not need it
+        out = StringIO()
+        call_command("load_transactions", "--from-snapshot", str(self.directory / "snapshots"), stdout=out)
+
+        self.assertIn("Imported 3 transactions", out.getvalue())
+        self.assertEqual(list(Transaction.objects.order_by('sync_key').values_list(
+            'sync_key', 'account__name', 'date', 'money_in', 'money_out', 'account_balance')), expected)
+        self.assertEqual(len(list_snapshots()), 1)       # restoring doesn't snapshot again
+
+    def test_snapshot_failure_does_not_fail_the_committed_import(self):
+        import pyarrow as pa
+
+        with patch("pyarrow.parquet.write_table", side_effect=pa.ArrowInvalid("bad column")):
+            result = import_from_sheet("sheet", "Register")
+
+        self.assertIsNone(result["snapshot"])
+        self.assertEqual(result["snapshot_error"], "bad column")
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_only_the_newest_snapshots_are_kept(self):
+        paths = [import_from_sheet("sheet", "Register")["snapshot"] for _ in range(3)]
+
+        self.assertEqual(list_snapshots(), [Path(path) for path in reversed(paths[1:])])
+
+
+class CategorySummaryQueryTest(TestCase):
+    """Query counts include the ``DataVersion`` lookup made by the report cache."""
+
+    def setUp(self):
+        get_report_cache().clear()
+
+    def load(self, count):
+        rows = [
+            [f'02/{day % 28 + 1:02d}/2025', f'Bank {day % 5}', f'Txn {day}', f'[Cat {day % 7}]',
+             None, str(day + 1), '0']
+            for day in range(count)
+        ]
+        import_transactions(make_sheet(rows))
+        Transaction.objects.create(date=date(2025, 2, 3), category='[Cat 0]', money_out=None)
+
+    def get_summary(self, start_date, end_date, queries):
+        with self.assertNumQueries(queries):
+            started = time.perf_counter()
+            response = self.client.get(reverse("category_summary"), {
+                "start_date": start_date, "end_date": end_date, "view_type": "table",
+            })
+            elapsed = time.perf_counter() - started
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 2.0)
+        return response
+
+    def test_query_count_is_constant_in_the_row_count(self):
+        for count in (10, 2000):
+            with self.subTest(count=count):
+                Transaction.objects.all().delete()
+                self.load(count)
+                self.get_summary("2025-02-01", "2025-02-28", queries=2)
+                self.get_summary("2025-01-15", "2025-03-14", queries=4)
+
+    def test_categories_sorted_by_spend_within_each_account(self):
+        self.load(70)
+
+        response = self.get_summary("2025-02-01", "2025-02-28", queries=2)
+
+        table = response.context["table_data"]
+        self.assertEqual(list(table), [f'Bank {i}' for i in range(5)])
+        amounts = [amount for _, amount in table['Bank 0']]
+        self.assertEqual(amounts, sorted(amounts, reverse=True))
+
+
+class ReportCacheTest(TestCase):
+
+    def setUp(self):
+        get_report_cache().clear()
+        import_transactions(make_sheet(SHEET_ROWS))
+        self.params = {"start_date": "2025-01-01", "end_date": "2025-01-31", "view_type": "table"}
+
+    def get(self):
+        return self.client.get(reverse("category_summary"), self.params)
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.get()
+        with self.assertNumQueries(1):
+            second = self.get()
+
+        self.assertEqual(first["X-Report-Cache"], "miss")
+        self.assertEqual(second["X-Report-Cache"], "hit")
+        self.assertEqual(second.content, first.content)
+        stats = report_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_import_invalidates_cached_reports(self):
+        self.get()
+        rows = SHEET_ROWS[:2] + [['01/08/2025', 'SBI', 'Fuel', '[Travel]', None, '900', '0']]
+        import_transactions(make_sheet(rows), incremental=True)
+
+        response = self.get()
+
+        self.assertEqual(response["X-Report-Cache"], "miss")
+        self.assertContains(response, "[Travel]")
+
+    def test_admin_edits_invalidate_cached_reports(self):
+        self.get()
+        admin = self.client_class()
+        admin.force_login(User.objects.create_superuser("admin"))
+        groceries = Transaction.objects.get(description="Groceries")
+        admin.post(reverse("admin:account_transaction_delete", args=[groceries.pk]), {"post": "yes"})
+
+        response = self.get()
+
+        self.assertEqual(response["X-Report-Cache"], "miss")
+        self.assertNotContains(response, "[Food]")
+
+    def test_invalid_form_is_not_cached(self):
+        self.params["start_date"] = "not a date"
+        self.get()
+        self.assertEqual(self.get().get("X-Report-Cache"), None)
+
+
+class AccountCategoryAnalysisTest(TestCase):
+
+    def setUp(self):
+        get_report_cache().clear()
+        today = timezone.now().date()
+        this_month = today.replace(day=1).strftime('%m/%d/%Y')
+        last_month = (today.replace(day=1) - timedelta(days=1)).strftime('%m/%d/%Y')
+        import_transactions(make_sheet([
+            [this_month, 'SBI', 'Lunch', '[Food]', None, '1200', '0'],
+            [last_month, 'SBI', 'Dinner', '[Food]', None, '1400', '0'],
+            [last_month, 'SBI', 'Train', '[Travel]', None, '650', '0'],
+            [this_month, 'SBI', 'To HDFC', '[Transfer]', None, '5000', '0'],
+            [this_month, 'HDFC Savings', 'SIP', '[Saving]', None, '2600', '0'],
+            [this_month, 'Old Card', 'Shoes', '[Food]', None, '9999', '0'],
+        ]))
+        Bank.objects.filter(name='Old Card').update(is_active=False)
+
+    def test_averages_and_current_month_per_account(self):
+        response = self.client.get(reverse("analysis"))
+
+        self.assertTemplateUsed(response, "account/analysis.html")
+        analysis = response.context["analysis"]
+        self.assertEqual(list(analysis), ['HDFC Savings', 'SBI'])
+        self.assertEqual(analysis['SBI'].values.tolist(), [['[Food]', 1200.0, 200.0]])
+        self.assertEqual(response.context["total_average"], 200.0 + 50.0 + 200.0)
+        self.assertEqual(response.context["current_month_average_without_saving"], 1200.0)
+        self.assertNotContains(response, "[Transfer]")
+
+    def test_no_spending_renders_empty_analysis(self):
+        Transaction.objects.all().delete()
+        MonthlyCategoryTotal.objects.all().delete()
+
+        response = self.client.get(reverse("analysis"))
+
+        self.assertEqual(response.context["analysis"], {})
+        self.assertEqual(response.context["total_average"], 0.0)
+
+
+def fit_mean(months, values, horizon):
+    # A stand-in for fit_prophet: predicts the historical mean.
+    mean = sum(values) / len(values)
+    last = date.fromisoformat(months[-1])
+    return "{}", [
+        {"month": (last + relativedelta(months=i + 1)).isoformat(), "yhat": mean, "lower": 0.0, "upper": mean * 2}
+        for i in range(horizon)
+    ]
+
+
+@override_settings(FORECAST_HORIZON=2, FORECAST_MIN_HISTORY=3)
+class ForecastTest(TestCase):
+
+    def setUp(self):
+        forecast_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(forecast_dir.cleanup)
+        settings_override = override_settings(FORECAST_DIR=forecast_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        this_month = timezone.now().date().replace(day=1)
+        self.rows = [
+            [(this_month - relativedelta(months=m)).strftime('%m/%d/%Y'), 'SBI', f'Txn {m}', '[Food]', None, '300', '0']
+            for m in range(1, 5)
+        ]
+        self.rows.append([(this_month - relativedelta(months=1)).strftime('%m/%d/%Y'),
+                          'SBI', 'Once', '[Gift]', None, '900', '0'])
+        import_transactions(make_sheet(self.rows))
+
+    def test_trains_once_per_data_version_and_view_reads_the_result(self):
+        key, forecast, trained = train_forecasts(workers=1, fit=fit_mean)
+
+        self.assertTrue(trained)
+        self.assertEqual([(s["kind"], s["name"]) for s in forecast["series"]], [("account", "SBI"), ("category", "[Food]")])
+        self.assertEqual(forecast["skipped"][0]["name"], "[Gift]")
+        self.assertTrue((Path(settings.FORECAST_DIR) / key / forecast["series"][0]["model"]).exists())
+        self.assertEqual(train_forecasts(workers=1, fit=fit_mean)[2], False)
+
+        response = self.client.get(reverse("forecast"), {"by": "account"})
+        self.assertFalse(response.context["stale"])
+        self.assertEqual(response.context["rows"][0]["name"], "SBI")
+        self.assertEqual([p["yhat"] for p in response.context["rows"][0]["predictions"]], [525.0, 525.0])
+
+        import_transactions(make_sheet(self.rows[:-1]))
+        self.assertTrue(self.client.get(reverse("forecast")).context["stale"])
+
+    def test_view_without_forecast(self):
+        self.client.force_login(User.objects.create_user("viewer"))
+
+        response = self.client.get(reverse("forecast"))
+
+        self.assertIsNone(response.context["forecast"])
+        self.assertContains(response, "train_forecasts")
+
+
+class BalanceTest(TestCase):
+
+    def setUp(self):
+        rows = SHEET_ROWS[:3] + [
+            ['01/05/2025', 'HDFC Savings', 'Coffee', '[Food]', None, '200', '84,800.00'],
+            ['01/09/2025', 'SBI', 'Refund', '[Misc]', '500.50', None, '8,100.00'],   # should be 8,000.00
+        ]
+        import_transactions(make_sheet(rows))
+
+    def test_import_stores_daily_closing_balances_and_flags_mismatches(self):
+        self.assertEqual(
+            list(DailyBalance.objects.order_by('account__name', 'date').values_list('account__name', 'date', 'balance')),
+            [
+                ("HDFC Savings", date(2025, 1, 5), Decimal("84800.00")),
+                ("HDFC Savings", date(2025, 1, 6), Decimal("184800.00")),
+                ("SBI", date(2025, 1, 7), Decimal("7499.50")),
+                ("SBI", date(2025, 1, 9), Decimal("8000.00")),
+            ],
+        )
+        # The salary row's sheet balance ignored the coffee, and the refund's is off by 100.
+        self.assertEqual(
+            sorted(Transaction.objects.filter(balance_mismatch=True).values_list('description', flat=True)),
+            ["Refund", "Salary"],
+        )
+
+    def test_blank_sheet_balances_are_not_zero(self):
+        rows = [
+            ['02/01/2025', 'SBI', 'Tea', '[Food]', None, '100', None],
+            ['02/02/2025', 'SBI', 'Lunch', '[Food]', None, '100', '800'],
+            ['02/03/2025', 'SBI', 'Dinner', '[Food]', None, '100', ''],
+        ]
+        import_transactions(make_sheet(rows))
+
+        self.assertEqual(
+            list(DailyBalance.objects.order_by('date').values_list('balance', flat=True)),
+            [Decimal("900.00"), Decimal("800.00"), Decimal("700.00")],
+        )
+        self.assertFalse(Transaction.objects.filter(balance_mismatch=True).exists())
+        self.assertEqual(Transaction.objects.filter(account_balance__isnull=True).count(), 2)
+
+    def test_edits_outside_an_import_refresh_rollups_balances_and_the_data_version(self):
+        version = DataVersion.current()
+        refund = Transaction.objects.get(description="Refund")
+        refund.account_balance = Decimal("8000.00")
+        refund.save()
+        Transaction.objects.get(description="Coffee").delete()
+        groceries = Transaction.objects.get(description="Groceries")
+        groceries.date = date(2025, 2, 7)
+        groceries.save()
+
+        # Salary matches without the coffee; Groceries' sheet balance now predates the refund.
+        self.assertEqual(
+            list(Transaction.objects.filter(balance_mismatch=True).values_list('description', flat=True)),
+            ["Groceries"],
+        )
+        self.assertEqual(
+            list(DailyBalance.objects.filter(account__name="HDFC Savings").order_by('date').values_list('balance', flat=True)),
+            [Decimal("85000.00"), Decimal("185000.00")],
+        )
+        self.assertEqual(
+            list(MonthlyCategoryTotal.objects.filter(category="[Food]").values_list('month', 'money_out', 'txn_count')),
+            [(date(2025, 2, 1), Decimal("2500.50"), 1)],
+        )
+        self.assertEqual(DataVersion.current(), version + 3)
+
+        bank = Bank.objects.get(name="SBI")
+        bank.is_active = False
+        bank.save()
+        self.assertEqual(DataVersion.current(), version + 4)
+
+    def test_series_carries_balances_forward_and_view_lists_mismatches(self):
+        days, balances = balance_series(date(2025, 1, 6), date(2025, 1, 10), points=3)
+
+        self.assertEqual(days, [date(2025, 1, 6), date(2025, 1, 8), date(2025, 1, 10)])
+        self.assertEqual(balances, {"HDFC Savings": [184800.0] * 3, "SBI": [None, 7499.5, 8000.0]})
+
+        self.client.force_login(User.objects.create_user("viewer"))
+        response = self.client.get(reverse("balance"), {"start_date": "2025-01-01", "end_date": "2025-01-31"})
+
+        self.assertEqual([d["label"] for d in response.context["chart_data"]["datasets"]], ["HDFC Savings", "SBI"])
+        self.assertEqual(
+            [(row["account__name"], row["count"], row["first_date"]) for row in response.context["mismatches"]],
+            [("HDFC Savings", 1, date(2025, 1, 6)), ("SBI", 1, date(2025, 1, 9))],
+        )
+
+
+class ColumnarStoreTest(TestCase):
+
+    def setUp(self):
+        columnar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(columnar_dir.cleanup)
+        settings_override = override_settings(COLUMNAR_DIR=columnar_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.rows = SHEET_ROWS[:3] + [
+            ['02/10/2025', 'SBI', 'Train', '[Travel]', None, '800', '6,699.50'],
+            ['02/11/2025', 'SBI', 'Move', '[Transfer]', None, '1,000', '5,699.50'],
+            ['03/02/2025', 'HDFC Savings', 'Dinner', '[Food]', None, '1,200.25', '1,83,800.00'],
+            ['03/03/2025', 'Old Bank', 'Fee', '[Food]', None, '50', '0'],
+        ]
+        import_transactions(make_sheet(self.rows))
+        Bank.objects.filter(name="Old Bank").update(is_active=False)
+
+    def assertSameTotals(self, *args, **kwargs):
+        with override_settings(REPORT_ENGINE="orm"):
+            expected = monthly_totals(*args, **kwargs)
+        get_store()
+        # Only the store key lookup, plus the active bank names when filtered on them.
+        with override_settings(REPORT_ENGINE="columnar"), self.assertNumQueries(1 + ('account__is_active' in kwargs)):
+            actual = monthly_totals(*args, **kwargs)
+        fields = args[2]
+        key = lambda row: tuple(str(row[field]) for field in fields)
+        self.assertEqual(sorted(actual, key=key), sorted(expected, key=key))
+        return actual
+
+    def test_totals_match_the_orm(self):
+        self.assertSameTotals(date(2025, 1, 1), date(2025, 3, 31), ('account__name', 'category', 'month'),
+                              exclude={'category__in': ['[Transfer]']}, account__is_active=True, paise=True)
+        rows = self.assertSameTotals(date(2025, 1, 6), date(2025, 2, 10), ('account__name', 'category'),
+                                     order_by=('account__name', '-total_out'))
+        self.assertEqual(rows[0], {'account__name': "HDFC Savings", 'category': "[Salary]",
+                                   'total_in': Decimal("100000.00"), 'total_out': Decimal("0.00"), 'txn_count': 1})
+        self.assertSameTotals(date(2025, 1, 1), date(2025, 12, 31), ('month',), category="[Food]")
+
+    def test_store_is_memory_mapped_and_rebuilt_on_import(self):
+        store = get_store()
+        self.assertIsInstance(store['money_out'], np.memmap)
+        self.assertEqual(len(store), 7)
+        self.assertEqual([int(day) for day in store['day'][:2]], [20093, 20094])  # 2025-01-05, 2025-01-06
+
+        with override_settings(REPORT_ENGINE="columnar"):
+            import_transactions(make_sheet(self.rows[:3]))
+            self.assertEqual(len(get_store()), 3)
+            self.assertEqual([path.name for path in Path(settings.COLUMNAR_DIR).iterdir()], [get_store().key])
+
+            response = self.client.get(reverse("transaction"), {"start_date": "2025-01-01", "end_date": "2025-12-31"})
+        self.assertEqual(
+            {account: [txn.description for txn in txns] for account, txns in response.context["transactions_by_account"].items()},
+            {"HDFC Savings": ["Rent"], "SBI": ["Groceries"]},
+        )
+
+
+class TopNPerGroupTest(TestCase):
+    """Runs on whichever database is configured: SQLite by default, PostgreSQL
+    when the POSTGRES_* variables are set."""
+
+    def setUp(self):
+        rows = [
+            ['03/01/2025', f'Bank {i % 3}', f'Txn {i}', '[Misc]', None, str(i * 10), '0']
+            for i in range(1, 31)
+        ]
+        import_transactions(make_sheet(rows))
+
+    def test_top_n_of_every_group_in_one_query(self):
+        queryset = Transaction.objects.filter(money_out__gt=0)
+        with self.assertNumQueries(1):
+            rows = list(top_n_per_group(queryset, ['account__name'], ['-money_out', '-id'], 3).values_list(
+                'account__name', 'money_out', 'row_number'))
+
+        self.assertEqual(rows, [
+            ('Bank 0', 300.0, 1), ('Bank 0', 270.0, 2), ('Bank 0', 240.0, 3),
+            ('Bank 1', 280.0, 1), ('Bank 1', 250.0, 2), ('Bank 1', 220.0, 3),
+            ('Bank 2', 290.0, 1), ('Bank 2', 260.0, 2), ('Bank 2', 230.0, 3),
+        ])
+
+    def test_transaction_summary_takes_n_from_the_request(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("transaction"), {
+                "start_date": "2025-03-01", "end_date": "2025-03-31", "limit": 4,
+            })
+
+        self.assertEqual(response.context["title"], "Top 4 Transactions")
+        by_account = response.context["transactions_by_account"]
+        self.assertEqual(sorted(by_account), ['Bank 0', 'Bank 1', 'Bank 2'])
+        self.assertTrue(all(len(txns) == 4 for txns in by_account.values()))
+
+
+class CategoryTransactionListingTest(TestCase):
+
+    def setUp(self):
+        sheet_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(sheet_dir.cleanup)
+        pd.DataFrame({0: ['[Food]', '[Rent]']}).to_csv(
+            os.path.join(sheet_dir.name, f"{os.environ['DROP_DOWN']}.csv"), index=False, header=False)
+        settings_override = override_settings(SHEET_SOURCE_DIR=sheet_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        rows = [['04/01/2025', 'SBI', f'Food {i}', '[Food]', None, str(100 + i % 10), '0'] for i in range(30)]
+        rows.append(['04/02/2025', 'HDFC Savings', 'Rent', '[Rent]', None, '9000', '0'])
+        import_transactions(make_sheet(rows))
+        self.params = {"start_date": "2025-04-01", "end_date": "2025-04-30", "category": "[Food]"}
+        self.client.force_login(User.objects.create_user("reader"))
+
+    def test_keyset_pages_cover_every_row_once(self):
+        response = self.client.get(reverse("category_transaction"), self.params)
+
+        first_page = response.context["transactions_by_account"]["SBI"]
+        self.assertEqual(list(response.context["transactions_by_account"]), ["SBI"])
+        self.assertEqual(len(first_page), 25)
+        next_page = response.context["next_pages"]["SBI"]
+        self.assertIn("after_id=", next_page)
+
+        response = self.client.get(f'{reverse("category_transaction_page")}?{next_page}')
+
+        self.assertEqual(len(response.context["txns"]), 5)
+        self.assertIsNone(response.context["next_page"])
+        seen = {txn["id"] for txn in first_page} | {txn["id"] for txn in response.context["txns"]}
+        self.assertEqual(len(seen), 30)
+
+    def test_dropdown_is_stored_on_import_and_not_fetched_per_request(self):
+        sheet_dir = settings.SHEET_SOURCE_DIR
+        pd.DataFrame({0: ['[Rent]', '[Travel]', ' ', '[Rent]']}).to_csv(
+            os.path.join(sheet_dir, f"{os.environ['DROP_DOWN']}.csv"), index=False, header=False)
+        make_sheet(SHEET_ROWS).to_csv(os.path.join(sheet_dir, "Register.csv"), index=False)
+        with override_settings(SNAPSHOT_DIR=sheet_dir):
+            import_from_sheet("sheet", "Register", incremental=True)
+        self.assertEqual(list(Category.objects.values_list('name', flat=True)), ['[Rent]', '[Travel]'])
+
+        os.remove(os.path.join(sheet_dir, f"{os.environ['DROP_DOWN']}.csv"))
+        get_sheet_cache().clear()
+        misses = get_sheet_cache().stats()["misses"]
+        response = self.client.get(reverse("category_transaction"))
+
+        self.assertEqual([value for value, _ in response.context["form"].fields["category"].choices],
+                         ['', '[Rent]', '[Travel]'])
+        self.assertEqual(get_sheet_cache().stats()["misses"], misses)
+
+    def test_page_and_export_need_a_login(self):
+        self.client.logout()
+        page_params = {**self.params, "account": "SBI", "after_amount": "200", "after_id": "999999"}
+        for name, params in (("category_transaction_page", page_params), ("category_transaction_export", self.params)):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name), params)
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response["Location"].startswith(reverse("login")))
+                self.assertNotIn(b"Food", response.content)
+
+    def test_csv_export_streams_all_matching_rows(self):
+        response = self.client.get(reverse("category_transaction_export"), self.params)
+
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "Account,Date,Description,Category,Money Out")
+        self.assertEqual(len(lines), 31)
+        self.assertTrue(lines[1].startswith("SBI,2025-04-01,Food 29,[Food],109.0"))
+
+
+class ExplainReportsTest(TestCase):
+
+    # PostgreSQL may rightly prefer sequential scans on an empty test table.
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plans")
+    def test_report_queries_use_the_report_indexes(self):
+        out = StringIO()
+        call_command("explain_reports", "transaction_summary", "income_summary", stdout=out)
+
+        plan = out.getvalue()
+        self.assertIn("txn_debit_date_idx", plan)
+        self.assertIn("txn_category_date_idx", plan)
+
+
+class AsyncReportViewTest(TestCase):
+
+    def setUp(self):
+        get_report_cache().clear()
+        columnar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(columnar_dir.cleanup)
+        self.columnar_dir = columnar_dir.name
+        import_transactions(make_sheet(SHEET_ROWS))
+        self.params = {"start_date": "2025-01-01", "end_date": "2025-01-31", "group_by": "month"}
+
+    async def test_async_views_match_the_orm_totals(self):
+        response = await self.async_client.get(reverse("income"), self.params)
+        self.assertEqual(response.context["chart_data"], {"labels": ["Jan 2025"], "data": [100000.0]})
+
+        response = await self.async_client.get(reverse("transaction"), self.params)
+        by_account = response.context["transactions_by_account"]
+        self.assertEqual({account: [t.description for t in txns] for account, txns in by_account.items()},
+                         {"HDFC Savings": ["Rent"], "SBI": ["Groceries"]})
+
+        with override_settings(REPORT_ENGINE="columnar", COLUMNAR_DIR=self.columnar_dir):
+            response = await self.async_client.get(reverse("category_summary"), self.params)
+        self.assertEqual(response.context["table_data"]["SBI"], [("[Food]", Decimal("2500.50"))])
+
+
+class LoadTestCommandTest(TransactionTestCase):
+    # The handlers read from their own threads and connections, so the data must be committed.
+
+    def setUp(self):
+        get_report_cache().clear()
+        import_transactions(make_sheet(SHEET_ROWS))
+
+    def test_default_paths_render_data_through_both_interfaces(self):
+        paths = default_paths(today=date(2025, 6, 30))
+        self.client.force_login(User.objects.create_user("loadtest"))
+        contexts = {}
+        for name, path in zip(REPORT_URLS, paths):
+            with self.subTest(path=path):
+                contexts[name] = self.client.get(path).context
+                if "form" in contexts[name]:
+                    self.assertTrue(contexts[name]["form"].is_valid(), contexts[name]["form"].errors)
+        self.assertTrue(contexts["income"]["chart_data"]["data"])
+        self.assertNotEqual(contexts["trend"]["datasets"], "[]")
+
+        out = StringIO()
+        call_command("loadtest", requests=10, concurrency=2, paths=paths, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ["wsgi", "asgi"])
+        self.assertTrue(all("[200×10]" in line for line in lines), out.getvalue())
+
+
+class ReportViewSmokeTest(TestCase):
+
+    def setUp(self):
+        today = date.today()
+        rows = [
+            [(today - timedelta(days=i * 9)).strftime('%m/%d/%Y'), ['HDFC Savings', 'SBI'][i % 2], f'd{i}',
+             ['[Food]', '[Rent]', '[Salary]', '[Transfer]'][i % 4],
+             '1,000' if i % 4 == 2 else None, None if i % 4 == 2 else str(i * 10), None]
+            for i in range(40)
+        ]
+        import_transactions(make_sheet(rows))
+        self.client.force_login(User.objects.create_user('smoke', 'smoke@example.com', 'p'))
+        self.dates = {"start_date": (today - timedelta(days=400)).isoformat(), "end_date": today.isoformat()}
+
+    def test_report_views_render_with_their_context(self):
+        cases = [
+            ("category_summary", {"view_type": "table"}, ["chart_data", "table_data"]),
+            ("category_summary", {}, ["chart_data", "chart_data_json"]),
+            ("income", {"group_by": "month"}, ["chart_data"]),
+            ("income", {"group_by": "year"}, ["chart_data"]),
+            ("trend", {"group_by": "month"}, ["periods", "datasets"]),
+            ("trend", {"group_by": "year"}, ["periods", "datasets"]),
+            ("transaction", {}, ["transactions_by_account", "account_names"]),
+        ]
+        for name, params, keys in cases:
+            with self.subTest(name=name, params=params):
+                response = self.client.get(reverse(name), {**self.dates, **params})
+                self.assertEqual(response.status_code, 200)
+                for key in keys:
+                    self.assertTrue(response.context[key], key)
+
+        response = self.client.get(reverse("analysis"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("total_average", response.context)
+        self.assertEqual(self.client.get(reverse("home_view")).status_code, 200)
@@ -1,14 +1,6 @@
 # account/utils.py
 import pandas as pd
-import requests
-from io import StringIO
-from prophet import Prophet
-import pandas as pd
-from django.db.models.functions import ExtractYear, ExtractMonth
-from .models import Transaction
-from datetime import date
-from django.db.models import Sum, FloatField
-from django.db.models.functions import Coalesce
+from .sheets import get_sheet_cache
 
 
 def clean_money(value):
@@ -17,18 +9,73 @@ def clean_money(value):
     except (ValueError, TypeError):
         return 0.0
 
-def fetch_google_sheet(sheet_id, sheet_name, header=0):
-    url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise ValueError("❌ Failed to fetch the Google Sheet.")
-    return pd.read_csv(StringIO(response.text), header=header)
+def fetch_google_sheet(sheet_id, sheet_name, header=0, max_age=None):
+    """Return a sheet tab as a DataFrame through the shared sheet cache.
+
+    ``max_age=0`` forces a revalidation against the source, e.g. for imports.
+    """
+    return get_sheet_cache().get(sheet_id, sheet_name, header=header, max_age=max_age)
+
+
+TEXT_COLUMNS = ['Income and Expense Account', 'Description', 'Category']
+MONEY_COLUMNS = ['Income Money IN', 'Expense Money OUT', 'Account Balance']
+DATE_FORMAT = "%m/%d/%Y"
+
+
+def parse_money(series, keep_blank=False):
+    """Vectorized ``clean_money``: returns the float64 amounts and a mask of unparseable cells.
+
+    Empty cells count as 0.0, or stay NaN with ``keep_blank``; anything else
+    that is not a number is flagged instead of being silently zeroed.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        amounts = series.astype("float64")
+        return amounts if keep_blank else amounts.fillna(0.0), pd.Series(False, index=series.index)
+    text = series.where(series.notna(), "").astype(str).str.replace(',', '', regex=False).str.strip()
+    amounts = pd.to_numeric(text, errors='coerce')
+    invalid = amounts.isna() & (text != "")
+    amounts = amounts.astype("float64")
+    return amounts if keep_blank else amounts.fillna(0.0), invalid
+
+
+def parse_dates(series):
+    """Parse ``DATE_FORMAT`` strings, leaving unparseable cells as NaT."""
+    # A ledger has far fewer distinct dates than rows, so parse each one once.
+    codes, uniques = pd.factorize(series)
+    parsed = pd.DatetimeIndex(
+        pd.to_datetime(pd.Series(uniques, dtype=object), format=DATE_FORMAT, errors='coerce')
+    )
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index)
+
 
 def preprocess_transaction_data(df):
-    df = df[df['Income and Expense Account'].notna() & (df['Income and Expense Account'] != 'Total')]
-    
-    df['Income Money IN'] = df['Income Money IN'].fillna("0").apply(clean_money)
-    df['Expense Money OUT'] = df['Expense Money OUT'].fillna("0").apply(clean_money)
-    df['Account Balance'] = df['Account Balance'].fillna("0").apply(clean_money)
-    
-    return df
\ No newline at end of file
+    """Clean the raw register sheet.
+
+    Returns ``(df, rejected)``: the typed frame (datetime64 ``Date``, float64
+    amounts with blank balances left NaN, string text columns) and a ``row``/``column``/``value`` report
+    of the rows dropped because a date or amount could not be parsed.
+    """
+    df = df[df['Income and Expense Account'].notna() & (df['Income and Expense Account'] != 'Total')].copy()
+
+    raw = df[['Date'] + MONEY_COLUMNS]
+
+    invalid = {}
+    df['Date'] = parse_dates(df['Date'])
+    invalid['Date'] = df['Date'].isna()
+    for column in MONEY_COLUMNS:
+        # A blank balance means the sheet gives none, not a balance of zero.
+        df[column], invalid[column] = parse_money(df[column], keep_blank=column == 'Account Balance')
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("string")
+
+    mask = pd.DataFrame(invalid)
+    flagged = mask.stack()
+    flagged = flagged[flagged].index
+    rejected = pd.DataFrame({
+        'row': flagged.get_level_values(0),
+        'column': flagged.get_level_values(1),
+        # Blank cells come back as None rather than NaN, which JSON can't hold.
+        'value': [None if pd.isna(value) else value for value in (raw.at[row, column] for row, column in flagged)],
+    })
+    return df[~mask.any(axis=1)], rejected
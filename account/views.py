@@ -1,70 +1,72 @@
-from django.shortcuts import render
-from .models import Transaction, Bank
-from .forms import DateRangeForm, CategoryForm, CategoryTrendForm, SpecificCategoryForm
+from django.shortcuts import get_object_or_404, render
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.urls import reverse
+from django.db.models import Count, Min, Q
+from .models import ImportJob, SavingsSnapshot, Transaction
+from .forms import BalanceForm, TopTransactionsForm, CategoryForm, CategoryTrendForm, CategorySpendingTrendForm, SpecificCategoryForm, CategoryFilterForm, TransactionPageForm
 from collections import defaultdict, OrderedDict
 import random
 import json
-import locale
-from .utils import fetch_google_sheet, preprocess_transaction_data
-from datetime import datetime
+import csv
+from itertools import chain
+from urllib.parse import urlencode
+from .jobs import enqueue_import, job_progress
+from .rollups import amonthly_totals, aperiod_totals, monthly_totals
+from .reports import category_analysis, period_label, trend_datasets
+from .queries import top_n_per_group
+from .cache import cached_report, report_cache_stats
+from .formatting import format_inr_array
+from .balances import balance_series
+from .categories import category_choices
+from .columnar import top_debits
+from .forecast import SERIES_KINDS, forecast_months, load_forecast
+from .sheets import get_sheet_cache
+from .aio import arender, run_in_executor
+from asgiref.sync import sync_to_async
+from trackalytics.timing import timed
 import os
-from django.db.models import Sum
-import pandas as pd
-from django.db.models.functions import TruncMonth, TruncYear
+from django.conf import settings
 from django.utils.timezone import now
 from dateutil.relativedelta import relativedelta
 
-# Set Indian currency formatting
-locale.setlocale(locale.LC_ALL, 'en_IN.UTF-8')
-
-def format_inr(amount):
-    return f"₹{locale.format_string('%.2f', amount, grouping=True)}"
-
 def get_random_colors(n):
     return [f'#{random.randint(0, 0xFFFFFF):06x}' for _ in range(n)]
 
 # Home view
 def home_view(request):
     context = {
-        "message": None,
-        "success": None
+        "job": ImportJob.objects.order_by('-created_at', '-id').first(),
     }
     
     if request.method == "POST":
-        sheet_id = os.environ.get("SHEET_ID")
-        sheet_name = os.environ.get("TRANSACTION_SHEET_NAME")
-        try:
-            df = fetch_google_sheet(sheet_id, sheet_name)
-            Transaction.objects.all().delete()
-            df = preprocess_transaction_data(df)
-
-            for _, row in df.iterrows():
-                bank_obj, _ = Bank.objects.get_or_create(name=row['Income and Expense Account'])
-                Transaction.objects.create(
-                    account=bank_obj,
-                    date=datetime.strptime(row['Date'], "%m/%d/%Y"),
-                    description=row.get('Description', ''),
-                    category=row.get('Category', ''),
-                    money_in=row['Income Money IN'],
-                    money_out=row['Expense Money OUT'],
-                    account_balance=row['Account Balance']
-                )
-            context = {
-                "message": "✅ Transactions imported successfully.",
-                "success": True
-            }
-        except Exception as e:
-            context = {
-                "message": str(e),
-                "success": False
-            }
-
-        return render(request, "account/partials/transaction_status.html", context)
+        job = enqueue_import(
+            os.environ.get("SHEET_ID"),
+            os.environ.get("TRANSACTION_SHEET_NAME"),
+            incremental=request.POST.get("mode") == "incremental",
+            user=request.user,
+        )
+        return render(request, "account/partials/transaction_status.html", {
+            "job": job,
+            "progress": job_progress(job),
+        })
 
+    if context["job"]:
+        context["progress"] = job_progress(context["job"])
     return render(request, "account/home.html", context)
 
+
+def import_status(request, job_id):
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return render(request, "account/partials/transaction_status.html", {
+        "job": job,
+        "progress": job_progress(job),
+    })
+
 # Category view
-def category_summary(request):
+@cached_report("category_summary", CategoryForm)
+async def category_summary(request):
     form = CategoryForm(request.GET or None)
     chart_data = {}
     table_data = {}
@@ -73,24 +75,21 @@ def category_summary(request):
         start_date = form.cleaned_data['start_date']
         end_date = form.cleaned_data['end_date']
         
-        transactions = Transaction.objects.filter(date__range=[start_date, end_date])
-
-        # Group transactions by account and category
-        grouped_data = defaultdict(lambda: defaultdict(float))
-        for txn in transactions:
-            if txn.money_out > 0:
-                grouped_data[str(txn.account)][txn.category] += txn.money_out
-
-        # Sort each account's categories by amount (descending)
-        for account in grouped_data:
-            grouped_data[account] = OrderedDict(
-                sorted(grouped_data[account].items(), key=lambda x: x[1], reverse=True)
-            )
+        rows = await amonthly_totals(
+            start_date, end_date, ('account__name', 'category'),
+            order_by=('account__name', '-total_out'),
+        )
+
+        # Group spending by account, categories already sorted by amount (descending)
+        grouped_data = defaultdict(OrderedDict)
+        for row in rows:
+            if row['total_out'] > 0:
+                grouped_data[str(row['account__name'])][row['category']] = row['total_out']
 
         # Prepare chart and table data
         for i, (account, categories) in enumerate(grouped_data.items()):
             labels = list(categories.keys())
-            values = list(categories.values())
+            values = [float(amount) for amount in categories.values()]
             colors = get_random_colors(len(labels))
 
             # Chart data (values as raw numbers for Chart.js)
@@ -101,12 +100,10 @@ def category_summary(request):
                 'colors': colors
             }
 
-            # Table data (formatted as ₹)
-            table_data[account] = [
-                (category, format_inr(amount)) for category, amount in categories.items()
-            ]
+            # Table data (formatted as ₹ in the template)
+            table_data[account] = list(categories.items())
 
-    return render(request, 'account/category.html', {
+    return await arender(request, 'account/category.html', {
         'form': form,
         'chart_data': chart_data,
         'table_data': table_data,
@@ -116,95 +113,168 @@ def category_summary(request):
 
 
 # Transaction view
-def transaction_summary(request):
-    form = DateRangeForm(request.GET or None)
+async def transaction_summary(request):
+    form = TopTransactionsForm(request.GET or None)
+    limit = 10
     account_names = None
     transactions_by_account = None
 
     if form.is_valid():
         start_date = form.cleaned_data['start_date']
         end_date = form.cleaned_data['end_date']
-        transactions_by_account = dict()
-        
-        transactions = Transaction.objects.filter(date__range=[start_date, end_date]).exclude(money_out=0)
-        account_names = transactions.values_list("account__name", flat=True).distinct()
-
-        for account in account_names:
-            object_list = Transaction.objects.filter(
-                account__name=account,
-                date__range=[start_date, end_date]
-            ).exclude(money_out=0).order_by('-money_out')[:10]
+        limit = form.cleaned_data.get('limit') or limit
+        transactions_by_account = defaultdict(list)
+
+        if settings.REPORT_ENGINE == "columnar":
+            # Rank in the column store, then load just the rows shown
+            top_ids = await sync_to_async(top_debits)(start_date, end_date, limit)
+            found = await Transaction.objects.select_related('account').ain_bulk(
+                list(chain.from_iterable(top_ids.values()))
+            )
+            for account, ids in top_ids.items():
+                transactions_by_account[str(account)] = [found[pk] for pk in ids]
+        else:
+            transactions = Transaction.objects.filter(
+                date__range=[start_date, end_date], money_out__gt=0
+            ).select_related('account')
 
-            txns_formatted = []
-            for txn in object_list:
-                txn.money_out = format_inr(txn.money_out)
-                txns_formatted.append(txn)
+            # Top N debits of every account in a single query
+            async for txn in top_n_per_group(transactions, ['account__name'], ['-money_out', '-id'], limit):
+                transactions_by_account[str(txn.account)].append(txn)
 
-            transactions_by_account[account] = txns_formatted
+        transactions_by_account = dict(transactions_by_account)
+        account_names = list(transactions_by_account)
 
-    return render(request, 'account/transactions.html', {
-        "title": "Top 10 Transactions",
+    return await arender(request, 'account/transactions.html', {
+        "title": f"Top {limit} Transactions",
         "form": form,
         "account_names": account_names,
         "transactions_by_account": transactions_by_account
     })
 
+TRANSACTION_PAGE_SIZE = 25
+TRANSACTION_FIELDS = ('id', 'date', 'description', 'category', 'money_out', 'account__name')
+
+
+def category_debits(start_date, end_date, category=None):
+    transactions = Transaction.objects.filter(date__range=[start_date, end_date], money_out__gt=0)
+    if category:
+        transactions = transactions.filter(category=category)
+    return transactions
+
+
+def paginate_debits(rows, params):
+    """Trim the look-ahead row off a page and build the querystring of the next one.
+
+    Pages are ordered by ``(-money_out, -id)``, so the next page seeks past
+    the last row shown instead of using an offset.
+    """
+    rows = list(rows)
+    next_page = None
+    if len(rows) > TRANSACTION_PAGE_SIZE:
+        rows = rows[:TRANSACTION_PAGE_SIZE]
+        last = rows[-1]
+        next_page = urlencode({
+            **params,
+            "account": last["account__name"],
+            "after_amount": last["money_out"],
+            "after_id": last["id"],
+        })
+    return rows, next_page
+
+
 # Transaction view
 def transaction_summary_by_category(request):
-    sheet_id = os.environ.get("SHEET_ID")
-    sheet_name = os.environ.get("DROP_DOWN")
-    df = fetch_google_sheet(sheet_id, sheet_name, None)
-    first_col = df.iloc[:, 0]
-    categories = first_col.dropna()
-    categories = categories[categories.astype(str).str.strip()  != ""].tolist()
-    
-    form = SpecificCategoryForm(request.GET or None, categories=categories)
+    form = SpecificCategoryForm(request.GET or None, categories=category_choices())
     account_names = None
     transactions_by_account = None
+    next_pages = None
+    export_url = None
 
     if form.is_valid():
         start_date = form.cleaned_data['start_date']
         end_date = form.cleaned_data['end_date']
         category = form.cleaned_data.get('category')
+        params = {"start_date": start_date, "end_date": end_date, "category": category}
         transactions_by_account = dict()
-        
-        transactions = Transaction.objects.filter(date__range=[start_date, end_date]).exclude(money_out=0)
-
-        if category:
-            transactions = transactions.filter(category=category)
-
-        account_names = transactions.values_list("account__name", flat=True).distinct()
-
-        for account in account_names:
-            if category:  
-                object_list = Transaction.objects.filter(
-                    account__name=account,
-                    date__range=[start_date, end_date],
-                    category=category
-                ).exclude(money_out=0).order_by('-money_out')
-            else:
-                object_list = Transaction.objects.filter(
-                    account__name=account,
-                    date__range=[start_date, end_date]
-                ).exclude(money_out=0).order_by('-money_out')
-            
-
-            txns_formatted = []
-            for txn in object_list:
-                txn.money_out = format_inr(txn.money_out)
-                txns_formatted.append(txn)
-
-            transactions_by_account[account] = txns_formatted
+        next_pages = dict()
+
+        # First page of every account in one query, plus one row to tell if there is more
+        first_pages = defaultdict(list)
+        transactions = category_debits(start_date, end_date, category).values(*TRANSACTION_FIELDS)
+        for row in top_n_per_group(transactions, ['account__name'], ['-money_out', '-id'], TRANSACTION_PAGE_SIZE + 1):
+            first_pages[row["account__name"]].append(row)
+
+        for account, rows in first_pages.items():
+            transactions_by_account[account], next_pages[account] = paginate_debits(rows, params)
+
+        account_names = list(transactions_by_account)
+        export_url = f"{reverse('category_transaction_export')}?{urlencode(params)}"
 
     return render(request, 'account/transactions.html', {
         "title": "Transactions By Category",
         "form": form,
         "account_names": account_names,
-        "transactions_by_account": transactions_by_account
+        "transactions_by_account": transactions_by_account,
+        "next_pages": next_pages,
+        "export_url": export_url
+    })
+
+
+@login_required
+def transaction_page(request):
+    """Next page of one account's debits, requested by htmx from the "Load more" row."""
+    form = TransactionPageForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    data = form.cleaned_data
+    transactions = category_debits(data['start_date'], data['end_date'], data['category']).filter(
+        Q(money_out__lt=data['after_amount']) | Q(money_out=data['after_amount'], id__lt=data['after_id']),
+        account__name=data['account'],
+    ).order_by('-money_out', '-id').values(*TRANSACTION_FIELDS)[:TRANSACTION_PAGE_SIZE + 1]
+
+    params = {"start_date": data['start_date'], "end_date": data['end_date'], "category": data['category']}
+    txns, next_page = paginate_debits(transactions, params)
+    return render(request, 'account/partials/transaction_rows.html', {
+        "txns": txns,
+        "next_page": next_page
     })
 
 
-def income_summary(request):
+class Echo:
+    """A file-like object whose write() hands the value back, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+@login_required
+def transaction_export(request):
+    """Stream every debit matching the category form as CSV."""
+    form = CategoryFilterForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    data = form.cleaned_data
+    rows = (
+        category_debits(data['start_date'], data['end_date'], data['category'])
+        .order_by('account__name', '-money_out', '-id')
+        .values_list('account__name', 'date', 'description', 'category', 'money_out')
+        .iterator(chunk_size=2000)
+    )
+    writer = csv.writer(Echo())
+    header = ['Account', 'Date', 'Description', 'Category', 'Money Out']
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in chain([header], rows)),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="transactions_{data["start_date"]}_{data["end_date"]}.csv"'
+    return response
+
+
+@cached_report("income_summary", CategoryTrendForm)
+async def income_summary(request):
     form = CategoryTrendForm(request.GET or None)
     chart_data = dict()
 
@@ -213,247 +283,69 @@ def income_summary(request):
         end_date = form.cleaned_data['end_date']
         group_by = form.cleaned_data["group_by"]
 
-        transactions = Transaction.objects.filter(
-            date__range=[start_date, end_date],
-            category="[Salary]"
-            )
-        
-        if group_by == "month":
-            transactions = transactions.annotate(period=TruncMonth('date'))
-            period_format = "%b %Y"  # e.g., "Aug 2025"
-        else:
-            transactions = transactions.annotate(period=TruncYear('date'))
-            period_format = "%Y"  # e.g., "2025"
-
-        summary = transactions.values('period').annotate(total_money_in=Sum('money_in')).order_by('period')
+        summary = sorted(
+            await aperiod_totals(start_date, end_date, group_by, category="[Salary]"),
+            key=lambda row: row['period']
+        )
 
         chart_data = {
-            'labels': [entry['period'].strftime(period_format) for entry in summary],
-            'data': [entry['total_money_in'] for entry in summary]
+            'labels': [period_label(entry['period'], group_by) for entry in summary],
+            'data': [float(entry['total_in']) for entry in summary]
         }
 
-    return render(request, 'account/income_summary.html', {
+    return await arender(request, 'account/income_summary.html', {
         "form": form,
         "chart_data": chart_data
     })
 
-def category_spending_trend(request):
-    form = CategoryTrendForm(request.GET or None)
+@cached_report("category_spending_trend", CategorySpendingTrendForm)
+async def category_spending_trend(request):
+    form = CategorySpendingTrendForm(request.GET or None)
     periods, datasets = [], []
+    top = 10
 
     if form.is_valid():
         start_date = form.cleaned_data["start_date"]
         end_date = form.cleaned_data["end_date"]
         group_by = form.cleaned_data["group_by"]
+        top = form.cleaned_data.get("top") or top
 
-        transactions = Transaction.objects.filter(
-            date__gte=start_date,
-            date__lte=end_date,
-            money_out__gt=0
-        )
-
-        # Top 10 categories
-        top_categories = (
-            transactions
-            .values("category")
-            .annotate(total_spent=Sum("money_out"))
-            .order_by("-total_spent")[:10]
-        )
-        top_category_names = [cat["category"] for cat in top_categories]
-
-        # Filter for top categories only
-        filtered = transactions.filter(category__in=top_category_names)
-
-        # Group by month or year
-        date_group = TruncYear("date") if group_by == "year" else TruncMonth("date")
-
-        grouped_data = (
-            filtered
-            .annotate(period=date_group)
-            .values("period", "category")
-            .annotate(total_spent=Sum("money_out"))
-            .order_by("period")
-        )
-
-        # Build x-axis labels
-        periods = sorted(list({
-            entry["period"].strftime("%Y-%m") if group_by == "month" else entry["period"].strftime("%Y")
-            for entry in grouped_data
-        }))
-
-        # Build datasets for Chart.js
-        for category in top_category_names:
-            data = []
-            for period in periods:
-                match = next((g["total_spent"] for g in grouped_data
-                              if g["category"] == category and
-                              (g["period"].strftime("%Y-%m") if group_by == "month" else g["period"].strftime("%Y")) == period), 0)
-                data.append(match)
-            datasets.append({
-                "label": category,
-                "data": data,
-                "fill": False,
-            })
+        rows = await aperiod_totals(start_date, end_date, group_by, ('category',))
+        periods, datasets = await run_in_executor(trend_datasets, rows, group_by, top)
 
     context = {
         "form": form,
+        "top": top,
         "periods": json.dumps(periods),
         "datasets": json.dumps(datasets)
     }
-    return render(request, "account/category_spending_trend.html", context)
-
-def fetch_savings_in_father_account(sheet_id):
-    sheet_name = os.environ.get("SAVINGS_IN_FATHER_ACCOUNT_SHEET_NAME")
-    df = fetch_google_sheet(sheet_id, sheet_name)
-    df["Account Number"] = df["Account Number"].apply(lambda x: str(int(x)) if pd.notnull(x) else "")
-    df = df.rename(columns={"Savings In Father Account Account": "Account"})
-    df = df.fillna("")
-    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    exclude_columns = ["Document"]
-    df_filtered = df_clean.drop(columns=exclude_columns)
-    return df_filtered
-
-def fetch_savings_in_personl_account(sheet_id):
-    sheet_name = os.environ.get("SAVINGS_IN_PERSONAL_ACCOUNT_SHEET_NAME")
-    df = fetch_google_sheet(sheet_id, sheet_name)
-    df["Account Number"] = df["Account Number"].apply(lambda x: str(int(x)) if pd.notnull(x) else "")
-    df = df.rename(columns={"Savings Account Account": "Account"})
-    df = df.fillna("")
-    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    exclude_columns = ["Document"]
-    df_filtered = df_clean.drop(columns=exclude_columns)
-    return df_filtered
-
-def fetch_savings_in_gold(sheet_id):
-    sheet_name = os.environ.get("SAVINGS_IN_GOLD")
-    df = fetch_google_sheet(sheet_id, sheet_name)
-    df = df.rename(columns={"Gold Saving Date": "Date"})
-    df = df.fillna("")
-    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    return df_clean
-
-def fetch_mutual_funds(sheet_id):
-    sheet_name = os.environ.get("SAVINGS_IN_MUTUAL_FUNDS")
-    df = fetch_google_sheet(sheet_id, sheet_name)
-    df = df.rename(columns={"Mutual Funds Profile Fund Name": "Fund Name"})
-    df = df.fillna("")
-    return df
-
-def fetch_lic(sheet_id):
-    sheet_name = os.environ.get("SAVINGS_IN_LIC")
-    df = fetch_google_sheet(sheet_id, sheet_name)
-    df = df.rename(columns={"LIC Account": "Account"})
-    df = df.fillna("")
-    df_clean = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    columns_to_keep = ['Premium Year', 'Premium Date', 'Balance', 'Paid']
-    df_filtered = df_clean[columns_to_keep]
-    df_filtered = df_filtered[df_filtered['Paid'] == 'Yes']
-    df_filtered["Premium Year"] = df_filtered["Premium Year"].astype(int)
-    exclude_columns = ["Paid"]
-    df_filtered = df_filtered.drop(columns=exclude_columns)
-    return df_filtered
-
-
-def saving_view(request):
-    context = dict() 
-    object_list = list()
-    sheet_id = os.environ.get("SHEET_ID")
-    
-    # Savings In Father Account
-    df_filtered = fetch_savings_in_father_account(sheet_id)
-    total_row = df_filtered[df_filtered['Account'] == 'Total'].iloc[0]
-    nums = [
-        float(str(x).replace(',', '')) 
-        for x in total_row if isinstance(x, (int, float, str)) and str(x).replace(',', '').replace('.', '').isdigit()
-    ]
-    minimum_total, maximum_total = nums[:2]
-    saving_obj = {
-        "saving_type": "Savings In Parents Account",
-        "html_view": df_filtered.to_html(classes="table table-striped", index=False)
-    }
-    object_list.append(saving_obj)
-    
-    # Savings In Personal Account
-    df_filtered = fetch_savings_in_personl_account(sheet_id)
-    total_row = df_filtered[df_filtered['Account'] == 'Total'].iloc[0]
-    nums = [
-        float(str(x).replace(',', '')) 
-        for x in total_row if isinstance(x, (int, float, str)) and str(x).replace(',', '').replace('.', '').isdigit()
-    ]
-    current_minimum_total, current_maximum_total = nums[:2] 
-    minimum_total = minimum_total + current_minimum_total
-    maximum_total = maximum_total + current_maximum_total
-    saving_obj = {
-        "saving_type": "Savings In Personal Account",
-        "html_view": df_filtered.to_html(classes="table table-striped", index=False)
-    }
-    object_list.append(saving_obj)
-
-    # Savings in Gold
-    df_clean = fetch_savings_in_gold(sheet_id)
-    columns_to_keep = ['Date', 'Gold Type', 'Gross Weight', 'Gold Rate per gm', 'Purchased Amount']
-    df_filtered = df_clean[columns_to_keep]
-    df_filtered = df_filtered.dropna(how='all')
-    df_filtered = df_filtered[df_filtered['Date'].notna() & (df_filtered['Date'] != '')]
-    savings_in_gold_html = df_filtered.to_html(classes="table table-striped", index=False)
-    columns_to_keep = ['Overview', 'Value']
-    df_filtered = df_clean[columns_to_keep]
-    current_value = df_filtered.loc[df_filtered['Overview'] == 'Current Value', 'Value'].values[0]
-    selling_amount = df_filtered.loc[df_filtered['Overview'] == 'Selling Amount', 'Value'].values[0]
-    selling_amount = float(selling_amount.replace(',', ''))
-    current_value = float(current_value.replace(',', ''))
-    minimum_total = minimum_total + selling_amount
-    maximum_total = maximum_total + current_value
-    saving_obj = {
-        "saving_type": "Savings In Gold",
-        "html_view": savings_in_gold_html
-    }
-    object_list.append(saving_obj)
-
-    # Savings in Mutual Funds
-    df = fetch_mutual_funds(sheet_id)
-    df_selected = df.iloc[0:8, 8:16] 
-    mf_purchased_value = df.iloc[1, 21]
-    mf_current_value = df.iloc[1, 22]
-    mf_current_value = float(mf_current_value.replace(',', ''))
-    mf_purchased_value = float(mf_purchased_value.replace(',', ''))
-    minimum_total = minimum_total + mf_current_value
-    maximum_total = maximum_total + mf_purchased_value
-    saving_obj = {
-        "saving_type": "Savings In Mutual Funds",
-        "html_view": df_selected.to_html(classes="table table-striped", index=False)
-    }
-    object_list.append(saving_obj)
+    return await arender(request, "account/category_spending_trend.html", context)
 
-    # Savings in LIC
-    df_filtered = fetch_lic(sheet_id)
-    saving_obj = {
-        "saving_type": "Savings In LIC",
-        "html_view": df_filtered.to_html(classes="table table-striped", index=False)
-    }
-    object_list.append(saving_obj)
+async def saving_view(request):
+    tabs = [tab async for tab in SavingsSnapshot.objects.all()]
+    loaded = [tab for tab in tabs if tab.refreshed_at]
 
     context = {
-        "object_list": object_list,
-        "minimum_total": format_inr(minimum_total),
-        "maximum_total": format_inr(maximum_total)
+        "object_list": tabs,
+        "minimum_total": sum(tab.minimum for tab in loaded),
+        "maximum_total": sum(tab.maximum for tab in loaded),
+        # The oldest tab decides how stale the totals are.
+        "refreshed_at": min((tab.refreshed_at for tab in loaded), default=None),
+        "message": None if loaded else "Savings have not been loaded yet; run manage.py refresh_savings."
     }
+    return await arender(request, 'account/saving.html', context)
 
-    return render(request, 'account/saving.html', context)
-
+@cached_report("account_category_analysis")
 def account_category_analysis(request):
-    total_average = 0
-    current_month_average = 0
-    total_average_without_saving = 0
-    current_month_average_without_saving = 0
-    one_year_ago = now().date() - relativedelta(years=1)
-
-    # Fetch transactions
-    transactions = Transaction.objects.filter(
-        money_out__gt=0, date__gte=one_year_ago
-    ).values(
-        'account__name', 'account__is_active', 'date', 'category', 'money_out'
+    today = now().date()
+    one_year_ago = today - relativedelta(years=1)
+
+    # Monthly spending of active accounts, transfers excluded
+    rows = monthly_totals(
+        one_year_ago, today, ('account__name', 'category', 'month'),
+        exclude={'category__in': ['[Transfer]']}, account__is_active=True, paise=True,
     )
+    analysis, totals, overall = category_analysis(rows, one_year_ago, today)
 
     last_salary = (
         Transaction.objects
@@ -462,84 +354,83 @@ def account_category_analysis(request):
         .first()
     )
 
-    df = pd.DataFrame(transactions)
-
-    if df.empty:
-        return render(request, "analysis.html", {"analysis": {}})
-
-    # Clean data
-    df = df[df['account__is_active'] == True]
-    df = df[~df['category'].isin(['[Transfer]'])]
-    df['date'] = pd.to_datetime(df['date'])
-    df['year_month'] = df['date'].dt.to_period('M')
-
-    current_month = now().strftime('%Y-%m')
-    analysis = {}
-    df_filtered_global = pd.DataFrame(columns=['Category', 'Average'])
-
-    # Define 12-month range
-    all_months = pd.period_range(start=one_year_ago, end=now().date(), freq='M')
-
-    for account, acc_df in df.groupby('account__name'):
-        # Sum by category & month
-        monthly = acc_df.groupby(['category', 'year_month'])['money_out'].sum().reset_index()
-
-        # Expand with missing months = 0
-        categories = monthly['category'].unique()
-        full_index = pd.MultiIndex.from_product([categories, all_months], names=['category', 'year_month'])
-        monthly_full = monthly.set_index(['category', 'year_month']).reindex(full_index, fill_value=0).reset_index()
-
-        # Current month spending
-        current = monthly_full[monthly_full['year_month'].astype(str) == current_month]
-        current_dict = dict(zip(current['category'], current['money_out']))
-
-        # Average across ALL 12 months
-        avg_dict = (monthly_full.groupby('category')['money_out'].sum() / len(all_months)).to_dict()
-
-        # Merge into DataFrame
-        merged_df = pd.DataFrame({
-            'Category': list(avg_dict.keys()),
-            'Current_Month': [current_dict.get(cat, 0) for cat in avg_dict.keys()],
-            'Average': list(avg_dict.values())
-        }).round(2)
-
-        tbl_merged_df = merged_df[merged_df['Current_Month'] > 0]
-
-        if len(tbl_merged_df) > 0:
-            analysis[account] = tbl_merged_df
+    # Format INR for display
+    with timed("compute"):
+        overall["Average"] = format_inr_array(overall["Average"])
+        overall_html = overall.to_html(classes="table table-striped", index=False)
 
-        # Exclude savings
-        merged_df_without_saving = merged_df[~merged_df['Category'].isin(["[Saving]"])]
+    context = {
+        "analysis": analysis,
+        "last_salary": last_salary.money_in if last_salary else 0,
+        **totals,
+        "df_filtered_global_html_view": overall_html
+    }
+    return render(request, "account/analysis.html", context)
 
-        # Collect global averages (numeric values only)
-        df_filtered = merged_df[['Category', 'Average']]
-        df_filtered_global = pd.concat([df_filtered_global, df_filtered], ignore_index=True)
 
-        # Totals
-        total_average += merged_df['Average'].sum()
-        current_month_average += merged_df['Current_Month'].sum()
+def forecast_view(request):
+    by = request.GET.get("by")
+    if by not in SERIES_KINDS:
+        by = "category"
+    forecast, stale = load_forecast()
 
-        total_average_without_saving += merged_df_without_saving['Average'].sum()
-        current_month_average_without_saving += merged_df_without_saving['Current_Month'].sum()
+    context = {
+        "by": by,
+        "kinds": list(SERIES_KINDS),
+        "forecast": forecast,
+        "stale": stale,
+    }
+    if forecast:
+        months = forecast["months"]
+        context["months"] = [period_label(month, "month") for month in forecast_months(forecast)]
+        context["rows"] = [
+            {
+                "name": series["name"],
+                "total": series["total"],
+                "predictions": [
+                    next((p for p in series["predictions"] if p["month"] == month), None) for month in months
+                ],
+            }
+            for series in forecast["series"] if series["kind"] == by
+        ]
+    return render(request, "account/forecast.html", context)
 
-    # Global sum by category (keep numeric until final step)
-    df_filtered_global = df_filtered_global.groupby("Category", as_index=False)["Average"].sum()
 
-    # Sort by numeric values
-    df_filtered_global = df_filtered_global.sort_values(by="Average", ascending=False)
+@cached_report("balance", BalanceForm)
+def balance_view(request):
+    form = BalanceForm(request.GET or None)
+    days, datasets, mismatches = [], [], []
 
-    # Format INR for display
-    df_filtered_global["Average"] = df_filtered_global["Average"].apply(format_inr)
+    if form.is_valid():
+        start_date = form.cleaned_data["start_date"]
+        end_date = form.cleaned_data["end_date"]
+        account = form.cleaned_data.get("account")
+        filters = {"account__name": account} if account else {}
+
+        days, balances = balance_series(start_date, end_date, form.cleaned_data.get("points") or 120, **filters)
+        colors = get_random_colors(len(balances))
+        datasets = [
+            {"label": name, "data": values, "borderColor": color, "fill": False, "tension": 0.2, "spanGaps": True}
+            for (name, values), color in zip(balances.items(), colors)
+        ]
+        mismatches = (
+            Transaction.objects.filter(balance_mismatch=True, date__range=[start_date, end_date], **filters)
+            .values("account__name")
+            .annotate(count=Count("id"), first_date=Min("date"))
+            .order_by("account__name")
+        )
 
-    df_filtered_global_html_view = df_filtered_global.to_html(classes="table table-striped", index=False)
-    
     context = {
-        "analysis": analysis,
-        "last_salary": last_salary.money_in if last_salary else 0,
-        "total_average": round(total_average, 2),
-        "current_month_average": round(current_month_average, 2),
-        "total_average_without_saving": round(total_average_without_saving, 2),
-        "current_month_average_without_saving": round(current_month_average_without_saving, 2),
-        "df_filtered_global_html_view": df_filtered_global_html_view
+        "form": form,
+        "chart_data": {"labels": [day.strftime("%d %b %Y") for day in days], "datasets": datasets},
+        "mismatches": list(mismatches),
     }
-    return render(request, "account/analysis.html", context)
\ No newline at end of file
+    return render(request, "account/balance.html", context)
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse({
+        "report_cache": report_cache_stats(),
+        "sheet_cache": get_sheet_cache().stats()
+    })
@@ -0,0 +1,26 @@
+document.addEventListener("DOMContentLoaded", function() {
+    const chartElement = document.getElementById('balanceChart');
+    if (!chartElement) return;
+
+    // One dataset per account; days before an account's first balance are null
+    const chartData = JSON.parse(document.getElementById('balance-chart-data').textContent);
+
+    new Chart(chartElement.getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: chartData.labels || [],
+            datasets: chartData.datasets || []
+        },
+        options: {
+            responsive: true,
+            interaction: { mode: "index", intersect: false },
+            elements: { point: { radius: 0 } },
+            plugins: {
+                title: {
+                    display: true,
+                    text: "Daily Closing Balance"
+                }
+            }
+        }
+    });
+});
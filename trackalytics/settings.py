@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'trackalytics.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,7 +62,8 @@ ROOT_URLCONF = 'trackalytics.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, with render time reported by ServerTimingMiddleware.
+        'BACKEND': 'trackalytics.timing.TimedDjangoTemplates',
         'DIRS': [
             BASE_DIR / "templates",
         ],
@@ -78,6 +80,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'trackalytics.wsgi.application'
 
+# Where login_required sends anonymous users.
+LOGIN_URL = 'login'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -115,6 +120,24 @@ if POSTGRES_READY:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default; set CACHE_BACKEND / CACHE_LOCATION to share the
+# cache between workers, e.g. django.core.cache.backends.filebased.FileBasedCache
+# with a directory, or django.core.cache.backends.redis.RedisCache with a
+# redis:// URL (needs the redis package).
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "trackalytics"),
+    }
+}
+
+REPORT_CACHE_ALIAS = "default"
+
+REPORT_CACHE_TIMEOUT = int(os.environ.get("REPORT_CACHE_TIMEOUT", 60 * 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -157,6 +180,79 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = BASE_DIR / "staticfiles-cdn" 
 
+
+# Google Sheets
+# SHEET_SOURCE_DIR serves sheets from local <sheet name>.csv files instead of Google.
+
+SHEET_SOURCE_DIR = os.environ.get("SHEET_SOURCE_DIR")
+
+SHEET_FETCH_TIMEOUT = float(os.environ.get("SHEET_FETCH_TIMEOUT", 10))
+
+# Per-tab deadline for the concurrent savings sheet fetches in manage.py refresh_savings.
+SAVINGS_TAB_TIMEOUT = float(os.environ.get("SAVINGS_TAB_TIMEOUT", 15))
+
+# Threads the async report views run pandas work on (see account/aio.py).
+REPORT_EXECUTOR_WORKERS = int(os.environ.get("REPORT_EXECUTOR_WORKERS", 4))
+
+# Running imports whose worker has not sent a heartbeat for this many seconds
+# are assumed dead and failed, releasing the lock for the next queued job.
+# On SQLite the heartbeat pauses while an import writes (see account/jobs.py),
+# so keep this above the longest write phase.
+IMPORT_JOB_TIMEOUT = int(os.environ.get("IMPORT_JOB_TIMEOUT", 30 * 60))
+
+# Seconds between a running import's heartbeats (and at most between its progress updates).
+IMPORT_JOB_HEARTBEAT = float(os.environ.get("IMPORT_JOB_HEARTBEAT", 10))
+
+SHEET_CACHE = {
+    "TTL": int(os.environ.get("SHEET_CACHE_TTL", 300)),
+    "MAX_ENTRIES": int(os.environ.get("SHEET_CACHE_MAX_ENTRIES", 32)),
+}
+
+# Forecasts
+# Written by manage.py train_forecasts and read by the forecast view.
+
+FORECAST_DIR = os.environ.get("FORECAST_DIR", BASE_DIR / "forecasts")
+
+FORECAST_HORIZON = int(os.environ.get("FORECAST_HORIZON", 3))
+
+# Series with fewer complete months than this are not forecast.
+FORECAST_MIN_HISTORY = int(os.environ.get("FORECAST_MIN_HISTORY", 6))
+
+# Parquet snapshots of every sheet import (see account/snapshots.py), restorable
+# with manage.py load_transactions --from-snapshot.
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", BASE_DIR / "snapshots")
+
+SNAPSHOT_KEEP = int(os.environ.get("SNAPSHOT_KEEP", 30))
+
+# Report engine: "orm" runs report totals as SQL; "columnar" answers them from
+# memory-mapped NumPy columns in COLUMNAR_DIR, rebuilt on every import.
+REPORT_ENGINE = os.environ.get("REPORT_ENGINE", "orm")
+
+COLUMNAR_DIR = os.environ.get("COLUMNAR_DIR", BASE_DIR / "columnar")
+
+# Seconds a cold import of the WSGI module and URLconf may take (see trackalytics/startup.py).
+STARTUP_IMPORT_BUDGET = float(os.environ.get("STARTUP_IMPORT_BUDGET", 1.25))
+
+# Request timing (see trackalytics/timing.py)
+# Share of requests, 0 to 1, that get a Server-Timing header and a log line:
+# 1 times every request, 0.05 is cheap enough to leave on in production.
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "trackalytics.timing": {
+            "handlers": ["console"],
+            "level": os.environ.get("SERVER_TIMING_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
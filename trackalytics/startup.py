@@ -0,0 +1,42 @@
+"""
+Cold-start import profiling for the project.
+
+Used by the startup budget test and ``manage.py benchmark startup``. A worker
+imports the WSGI module at boot and the URLconf (and with it every view
+module) on its first request, so both count towards startup.
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+STARTUP_MODULES = ('trackalytics.wsgi', 'trackalytics.urls')
+
+# Only the code paths that use these may import them.
+LAZY_MODULES = ('prophet', 'cmdstanpy', 'matplotlib', 'plotly')
+
+
+def import_profile(modules=STARTUP_MODULES):
+    """
+    Import ``modules`` in a fresh interpreter under ``python -X importtime``.
+
+    Returns ``(seconds, profile)``: the cumulative import time of ``modules``
+    and a ``{module: cumulative seconds}`` map of everything they loaded.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'trackalytics.settings'},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        profile[name.strip()] = int(cumulative) / 1_000_000
+    return sum(profile.get(module, 0) for module in modules), profile
@@ -1,8 +1,13 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
 import os
 from django.core.exceptions import ValidationError
+import json
+from .startup import LAZY_MODULES, import_profile
+from .timing import RequestTimings, _timings, timed
 
 
 class TrackAlyticsTest(TestCase):
@@ -13,3 +18,58 @@ class TrackAlyticsTest(TestCase):
             validate_password(_secret_key)
         except ValidationError as e:
             self.fail(f"SECRET_KEY is not strong enough: {e}")
+
+
+class StartupTimeTest(SimpleTestCase):
+
+    def test_cold_import_stays_within_budget(self):
+        seconds, profile = import_profile()
+
+        self.assertFalse(
+            [module for module in LAZY_MODULES if module in profile],
+            "Heavy modules imported at startup",
+        )
+        slowest = sorted(profile.items(), key=lambda item: item[1], reverse=True)[:10]
+        self.assertLess(
+            seconds, settings.STARTUP_IMPORT_BUDGET,
+            f"Cold import took {seconds:.2f}s; slowest: {slowest}",
+        )
+
+
+class ServerTimingTest(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("viewer"))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_sampled_request_reports_queries_and_render_time(self):
+        with self.assertLogs("trackalytics.timing", "INFO") as logs:
+            response = self.client.get(reverse("balance"), {"start_date": "2025-01-01", "end_date": "2025-01-31"})
+
+        metrics = {part.split(";")[0] for part in response["Server-Timing"].split(", ")}
+        self.assertTrue({"db", "compute", "template", "total"} <= metrics)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record["view"], record["status"]), ("balance", 200))
+        self.assertGreater(record["db_queries"], 0)
+        self.assertIn(f'db;desc="{record["db_queries"]} queries"', response["Server-Timing"])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    def test_unsampled_request_is_left_alone(self):
+        response = self.client.get(reverse("balance"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_nested_blocks_are_timed_exclusively(self):
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        try:
+            with timed("compute"):
+                with timed("db"):
+                    with timed("db"):
+                        pass
+        finally:
+            _timings.reset(token)
+
+        self.assertEqual(timings.metrics["db"][0], 2)
+        self.assertEqual(timings.metrics["compute"][0], 1)
+        self.assertLess(sum(seconds for _, seconds in timings.metrics.values()), timings.summary()["total"][1] / 1000)
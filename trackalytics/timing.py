@@ -0,0 +1,198 @@
+# trackalytics/timing.py
+"""Per-request timing, reported as a ``Server-Timing`` header and a log line.
+
+``ServerTimingMiddleware`` samples a share of requests
+(``SERVER_TIMING_SAMPLE_RATE``) and, for those, collects:
+
+* ``db``: every query run for the request, with its count, including
+  those an async view runs on the ORM's worker thread;
+* ``sheet``: Google Sheet downloads and revalidations;
+* ``compute``: pandas work in code wrapped with ``timed("compute")``;
+* ``template``: top-level template renders, via ``TimedDjangoTemplates``.
+
+Times are exclusive, so a query issued while rendering a template counts
+towards ``db`` only, and the metrics never add up to more than ``total``.
+Outside a sampled request ``timed`` does nothing.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("db", "sheet", "compute", "template")
+
+_timings = ContextVar("request_timings", default=None)
+# Seconds spent in blocks nested inside the innermost open ``timed`` block.
+_nested = ContextVar("request_timings_nested", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            count, total = self.metrics.get(name, (0, 0.0))
+            self.metrics[name] = (count + 1, total + seconds)
+
+    def summary(self):
+        """``{metric: (count, milliseconds)}`` for ``METRICS`` and ``total``."""
+        total = time.perf_counter() - self.started
+        with self._lock:
+            summary = {name: (count, seconds * 1000) for name, (count, seconds) in self.metrics.items()}
+        summary["total"] = (1, total * 1000)
+        return summary
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block (or decorated function) to ``name``."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    parent = _nested.get()
+    nested = [0.0]
+    token = _nested.set(nested)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _nested.reset(token)
+        timings.add(name, elapsed - nested[0])
+        if parent is not None:
+            parent[0] += elapsed
+
+
+def propagate(fn):
+    """Wrap ``fn`` to record into the current request's timings when run on another thread."""
+    context = copy_context()
+    # Work on the other thread overlaps ours, so it must not count as nested time here.
+    context.run(_nested.set, None)
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+def _time_query(execute, sql, params, many, context):
+    if _timings.get() is None:
+        return execute(sql, params, many, context)
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+def _instrument(connection, **kwargs):
+    # Installed once per connection, for good: async views run their queries
+    # on other threads, whose connections a per-request wrapper would miss.
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(_instrument, dispatch_uid="trackalytics.timing")
+
+
+def server_timing_header(summary):
+    parts = []
+    for name in METRICS + ("total",):
+        if name not in summary:
+            continue
+        count, ms = summary[name]
+        desc = f';desc="{count} queries"' if name == "db" else ""
+        parts.append(f"{name}{desc};dur={ms:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """Time sampled requests; place it first in ``MIDDLEWARE`` so ``total`` covers the rest."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            _instrument(connection)
+
+    @staticmethod
+    def sampled():
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self.report(request, response, timings)
+
+    def report(self, request, response, timings):
+        summary = timings.summary()
+        header = server_timing_header(summary)
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {header}" if existing else header
+
+        match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "db_queries": summary.get("db", (0, 0.0))[0],
+            **{f"{name}_ms": round(summary.get(name, (0, 0.0))[1], 1) for name in METRICS + ("total",)},
+        }
+        logger.info(json.dumps(record), extra={"timing": record})
+        return response
+
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed("template"):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with renders timed as ``template``."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
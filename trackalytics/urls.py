@@ -18,13 +18,19 @@ from django.contrib import admin
 from django.urls import path
 from account.views import (
     home_view,
+    import_status,
     category_summary,
     transaction_summary,
     category_spending_trend,
     saving_view,
     income_summary,
     account_category_analysis,
-    transaction_summary_by_category
+    transaction_summary_by_category,
+    transaction_page,
+    transaction_export,
+    forecast_view,
+    balance_view,
+    metrics_view
 )
 from user.views import (
     login_view,
@@ -34,13 +40,19 @@ from user.views import (
 
 urlpatterns = [
     path("", home_view, name='home_view'),
+    path("import/<int:job_id>/", import_status, name='import_status'),
     path('summary/', category_summary, name='category_summary'),
     path('transaction/', transaction_summary, name='transaction'),
     path('category_transaction/', transaction_summary_by_category, name='category_transaction'),
+    path('category_transaction/page/', transaction_page, name='category_transaction_page'),
+    path('category_transaction/export/', transaction_export, name='category_transaction_export'),
     path('trend/', category_spending_trend, name='trend'),
     path('saving/', saving_view, name='saving'),
     path('income/', income_summary, name='income'),
     path('analysis/', account_category_analysis, name='analysis'),
+    path('forecast/', forecast_view, name='forecast'),
+    path('balance/', balance_view, name='balance'),
+    path('metrics/', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
     path("login/", login_view, name='login'),
     path("logout/", logout_view, name='logout'),